@@ -1,6 +1,11 @@
 import pygame
 import os
 import sys
+import threading
+from collections.abc import Mapping
+from functools import partial
+import surface_cache # On-disk cache of decoded pixels, so PNGs are only decoded once
+import atlas # Packed sprite sheets (built offline with src/atlas.py)
 
 # ----------------- Asset Base Path -----------------
 SND_PATH = "assets/sounds/"
@@ -19,54 +24,229 @@ def resource_path(relative_path: str) -> str:
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+# ----------------- Surface Conversion -----------------
+def prepare_surface(img, convert_alpha=True):
+    # Conversion needs a display mode; headless simulations keep the decoded surface
+    if pygame.display.get_surface() is None:
+        return img
+    return img.convert_alpha() if convert_alpha else img.convert()
+
+# ----------------- Packed Atlases -----------------
+def load_packed(name: str, keys=()):
+    """Return {key: frame} sliced from a built atlas, or None if it was not built or
+    lacks one of keys (callers then load the individual PNGs)."""
+    try:
+        frames = atlas.load_atlas(resource_path(atlas.ATLAS_PATH), name, prepare_surface)
+    except Exception as e:
+        print(f"[WARNING] Atlas {name} unusable, loading individual images instead\n{e}")
+        return None
+    if frames is None or any(key not in frames for key in keys):
+        return None
+    return frames
+
+_ui_frames = None # UI atlas frames ({} when not built), loaded with the first UI image
+_ui_frames_lock = threading.Lock()
+
+def ui_frames():
+    global _ui_frames
+    with _ui_frames_lock:
+        if _ui_frames is None:
+            _ui_frames = load_packed(atlas.UI_ATLAS) or {}
+    return _ui_frames
+
+def ui_frame(path: str):
+    # UI atlas frames are keyed by their path under the UI folder, without extension
+    relative = os.path.relpath(path, atlas.UI_PATH)
+    if relative.startswith(".."):
+        return None
+    return ui_frames().get(os.path.splitext(relative)[0].replace(os.sep, "/"))
+
 # ----------------- Image Loader -----------------
 def load_image(path: str, convert_alpha=True):
+    # UI images come from the packed UI atlas when it has been built
+    frame = ui_frame(path) if convert_alpha else None
+    if frame is not None:
+        return frame
     try:
-        img = pygame.image.load(resource_path(path))
-        return img.convert_alpha() if convert_alpha else img.convert()
+        # Reads the decoded pixels from the surface cache, decoding the PNG only on a miss
+        return surface_cache.load_surface(resource_path(path), partial(prepare_surface, convert_alpha=convert_alpha))
     except Exception as e:
         print(f"[ERROR] Failed to load image: {path}\n{e}")
         return None
 
-# ----------------- UI Helper Loader -----------------
-def load_ui_images(folder_path, name_map):
+# ----------------- Sound Loader -----------------
+def load_sound(path: str):
+    if not pygame.mixer.get_init():  # Headless simulations run without a mixer (and have no sounds)
+        return None
+    try:
+        return pygame.mixer.Sound(resource_path(path))
+    except Exception as e:
+        print(f"[ERROR] Sound loading failed: {path}\n{e}")
+        return None
+
+# ----------------- UI Helper Paths -----------------
+def ui_paths(folder_path, name_map, extension=".png"):
     return {
-        key: load_image(os.path.join(folder_path, f"{filename}.png"))
+        key: os.path.join(folder_path, f"{filename}{extension}")
         for key, filename in name_map.items()
     }
 
+# ----------------- Lazy Asset Mapping -----------------
+class LazyAssets(Mapping):
+    """Read-only name -> asset mapping that loads each asset the first time it is used.
+
+    Only the paths are registered up front, so start-up time and memory grow
+    with what is actually shown. Loading is guarded by a lock, so a scene can
+    be preloaded from a background thread while the main thread uses it.
+    """
+
+    def __init__(self, loader):
+        self.loader = loader # path -> asset (None if it failed)
+        self.paths = {} # Registered name -> path
+        self.loaded = {} # Name -> asset, once loaded
+        self.lock = threading.RLock()
+
+    def register(self, name_map):
+        """Declare assets by name -> path without loading them."""
+        self.paths.update(name_map)
+
+    def __getitem__(self, name):
+        try:
+            return self.loaded[name]
+        except KeyError:
+            pass
+        path = self.paths[name] # Unknown names raise KeyError like a dict
+        with self.lock:
+            if name not in self.loaded:
+                self.loaded[name] = self.loader(path)
+            return self.loaded[name]
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __contains__(self, name):
+        return name in self.paths
+
+    def preload(self, names):
+        """Load the given assets now (those already loaded are skipped)."""
+        for name in names:
+            if name in self.paths:
+                self[name]
+
+# ----------------- Character Image Paths --------------
+def character_image_path(character: str, action: str, index: int = 1):
+    return resource_path(f"assets/images/characters/{character}/{action}/{action}_{index}.png")
+
 # ----------------- Loading Animation Images --------------
 def load_animation(character: str, action: str, frame_count: int):
-        bace_path = f"assets/images/characters/{character}/{action}/{action}_"
-
-        return [
-        pygame.image.load(resource_path(f"{bace_path}{i}.png")).convert_alpha()
+    return [
+        surface_cache.load_surface(character_image_path(character, action, i), prepare_surface)
         for i in range(1, frame_count + 1)
     ]
 
 # ----------------- Loading Single Animation Images --------------
 def load_character(character: str, action: str):
-    path = f"assets/images/characters/{character}/{action}/{action}_1"
+    return surface_cache.load_surface(character_image_path(character, action), prepare_surface)
+
+# ----------------- Character Sprite Layout -----------------
+# One-frame states and the folder their image lives in
+STATIC_SPRITES = {
+    "stand": "stand",
+    "block": "guard",
+    "small_damage": "small_damage",
+    "big_damage": "big_damage",
+    "winner": "winner",
+}
+
+# Frame count of every multi-frame character animation (same for all characters)
+ANIMATION_FRAMES = {
+    "run": 6,
+    "jump": 4,
+    "throw": 3,
+    "defeated": 3,
+}
+
+# Animation frame counters are fixed point, in 1/FRAME_SCALE of a sprite frame:
+# integer steps advance them identically on every machine (no float drift)
+FRAME_SCALE = 100
+
+# Every image file of a character's sprites
+def character_image_paths(character: str):
+    paths = [character_image_path(character, folder) for folder in STATIC_SPRITES.values()]
+    for action, frame_count in ANIMATION_FRAMES.items():
+        paths += [character_image_path(character, action, i) for i in range(1, frame_count + 1)]
+    return paths
+
+# ----------------- Mirrored Sprite Atlas -----------------
+def load_sprite_atlas(character: str):
+    """Load every sprite of a character for both facing directions.
+
+    Returns {facing_right: {state: [frames]}}, where one-frame states hold a
+    single frame, so drawing never has to flip or allocate a surface.
+    """
+    keys = {state: [f"{folder}/{folder}_1"] for state, folder in STATIC_SPRITES.items()}
+    keys.update({
+        action: [f"{action}/{action}_{i}" for i in range(1, frame_count + 1)]
+        for action, frame_count in ANIMATION_FRAMES.items()
+    })
+    sheet = load_packed(character, [key for frames in keys.values() for key in frames])
     
-    return pygame.image.load(resource_path(f"{path}.png")).convert_alpha()
+    if sheet is not None:
+        # One decode for the whole character: every frame is a slice of its packed sheet
+        right = {state: [sheet[key] for key in frames] for state, frames in keys.items()}
+    else:
+        # No atlas built: one PNG per frame
+        right = {state: [load_character(character, folder)] for state, folder in STATIC_SPRITES.items()}
+        right.update({
+            action: load_animation(character, action, frame_count)
+            for action, frame_count in ANIMATION_FRAMES.items()
+        })
+    left = {
+        state: [pygame.transform.flip(frame, True, False) for frame in frames]
+        for state, frames in right.items()
+    }
+    return {True: right, False: left}
+
+# ----------------- Character Asset Registry -----------------
+CHARACTERS = ("naruto", "sasuke") # Every playable character
+character_assets = {}  # Character name -> {"sprites": atlas, "icon": head icon}, loaded once per process
+character_assets_lock = threading.Lock() # Sprites may be preloaded from a background thread
+
+def get_character_assets(character: str):
+    """Return a character's converted sprites and head icon, loading them on first request only."""
+    entry = character_assets.get(character)
+    if entry is None:
+        with character_assets_lock:
+            entry = character_assets.get(character)
+            if entry is None:
+                entry = character_assets[character] = {
+                    "sprites": load_sprite_atlas(character),
+                    "icon": images.get(f"{character}_head"),
+                }
+    return entry
 
 
 # ----------------- Image Assets -----------------
-images = {
-    "bg": load_image(os.path.join(BG_PATH, "bg.png")),
-    "logo": load_image(os.path.join(MENU_PATH, "game_logo.png")),
-    "back": load_image(os.path.join(MENU_PATH, "back_button.png")),
-}
+# Paths only: every image is loaded the first time it is used
+images = LazyAssets(load_image)
+images.register({
+    "bg": os.path.join(BG_PATH, "bg.png"),
+    "logo": os.path.join(MENU_PATH, "game_logo.png"),
+    "back": os.path.join(MENU_PATH, "back_button.png"),
+})
 
 # Main Menu
-images.update(load_ui_images(MENU_PATH, {
+images.register(ui_paths(MENU_PATH, {
     "start": "start_button",
     "help": "help_button",
     "exit": "exit_button",
 }))
 
 # Pause Menu
-images.update(load_ui_images(PAUSE_MENU_PATH, {
+images.register(ui_paths(PAUSE_MENU_PATH, {
     "pause_menu": "pause_menu",
     "resume": "resume_button",
     "restart": "restart_button",
@@ -76,39 +256,88 @@ images.update(load_ui_images(PAUSE_MENU_PATH, {
 }))
 
 # Win Banners
-images.update(load_ui_images(BANNERS_PATH, {
+images.register(ui_paths(BANNERS_PATH, {
     "naruto_win": "naruto_wins",
     "sasuke_win": "sasuke_wins",
 }))
 
 # Icons
-images.update(load_ui_images(ICONS_PATH, {
+images.register(ui_paths(ICONS_PATH, {
     "naruto_head": "naruto_head",
     "sasuke_head": "sasuke_head",
 }))
 
 # Weapons
-images.update(load_ui_images(WEAPON_PATH, {
+images.register(ui_paths(WEAPON_PATH, {
     "small_shuriken": "shur2",
     "big_shuriken": "shur",
 }))
 
 # ----------------- Sound Effects -----------------
-sounds = {}
-try:
-    sounds["click"] = pygame.mixer.Sound(resource_path(os.path.join(SND_PATH, "click.wav")))
-    sounds["throw"] = pygame.mixer.Sound(resource_path(os.path.join(SND_PATH, "shuriken.wav")))
-    sounds["jump"] = pygame.mixer.Sound(resource_path(os.path.join(SND_PATH, "jump.wav")))
-    sounds["hit"] = pygame.mixer.Sound(resource_path(os.path.join(SND_PATH, "hit.wav")))
-    sounds["block"] = pygame.mixer.Sound(resource_path(os.path.join(SND_PATH, "block.wav")))
-    
-except Exception as e:
-    print(f"[ERROR] Sound loading failed: {e}")
+# Registered even before pygame.init() (e.g. replay.watch imports battle first): whether
+# there is a mixer is only checked when a sound is loaded
+sounds = LazyAssets(load_sound)
+sounds.register(ui_paths(SND_PATH, {
+    "click": "click",
+    "throw": "shuriken",
+    "jump": "jump",
+    "hit": "hit",
+    "block": "block",
+}, extension=".wav"))
 
 # ----------------- Background Music -----------------
-try:
-    pygame.mixer.music.load(resource_path(os.path.join(SND_PATH, "bg_music.mp3")))
-    pygame.mixer.music.play(-1)
-except Exception as e:
-    print(f"[WARNING] Background music failed: {e}")
+def play_music():
+    """Start the looping background music (called once the menu is on screen, so
+    decoding the MP3 does not delay the first frame)."""
+    if not pygame.mixer.get_init():
+        return
+    try:
+        pygame.mixer.music.load(resource_path(os.path.join(SND_PATH, "bg_music.mp3")))
+        pygame.mixer.music.play(-1)
+    except Exception as e:
+        print(f"[WARNING] Background music failed: {e}")
+
+# ----------------- Scene Manifest -----------------
+# What each scene draws and plays, so it can be loaded before it is shown
+SCENES = {
+    "menu": {
+        "images": ["bg", "logo", "start", "help", "exit"],
+        "sounds": ["click"],
+    },
+    "help": {
+        "images": ["back"],
+        "sounds": ["click"],
+    },
+    "battle": {
+        "images": [
+            "bg", "pause_menu", "pause", "resume", "restart", "exit1", "home",
+            "naruto_win", "sasuke_win", "naruto_head", "sasuke_head",
+            "small_shuriken", "big_shuriken",
+        ],
+        "sounds": ["click", "throw", "jump", "hit", "block"],
+        "characters": ["naruto", "sasuke"],
+    },
+}
+
+def preload_scene(scene: str):
+    """Load every asset a scene uses now (already loaded ones are skipped)."""
+    manifest = SCENES[scene]
+    images.preload(manifest.get("images", ()))
+    sounds.preload(manifest.get("sounds", ()))
+    for character in manifest.get("characters", ()):
+        get_character_assets(character)
+
+def warm_cache():
+    """Fill the surface cache with every image the game can show, in a background
+    thread (see surface_cache.warm), and return the thread."""
+    sources = [resource_path(path) for path in images.paths.values()]
+    sources += [path for character in CHARACTERS for path in character_image_paths(character)]
+    return surface_cache.warm(sources)
 
+def preload_scene_async(scene: str):
+    """Load a scene's assets in a background thread (e.g. the battle while the menu
+    is shown) and return the thread. Using an asset before it is done simply
+    waits for it."""
+    thread = threading.Thread(target=preload_scene, args=(scene,), name=f"preload-{scene}", daemon=True)
+    thread.start()
+    return thread
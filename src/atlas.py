@@ -0,0 +1,122 @@
+import argparse
+import json
+import os
+import pygame
+import surface_cache
+
+# ----------------- Atlas Settings -----------------
+ATLAS_PATH = "assets/images/atlases/" # Generated sheets and manifests (not in git, see README)
+CHARACTERS_PATH = "assets/images/characters/"
+UI_PATH = "assets/images/ui/"
+UI_ATLAS = "ui" # Name of the atlas packing every image under UI_PATH
+MAX_WIDTH = 2048 # Widest sheet the packer builds
+PADDING = 1 # Transparent pixels between frames
+
+# ----------------- Packing -----------------
+def collect_sources(folder):
+    """Return {key: path} of every PNG under folder, keyed by its relative path
+    without extension ("run/run_1", "main_menu/start_button")."""
+    sources = {}
+    for root, _, files in os.walk(folder):
+        for filename in files:
+            if filename.endswith(".png"):
+                path = os.path.join(root, filename)
+                key = os.path.splitext(os.path.relpath(path, folder))[0].replace(os.sep, "/")
+                sources[key] = path
+    return dict(sorted(sources.items()))
+
+def pack_shelves(sizes, max_width=MAX_WIDTH, padding=PADDING):
+    """Place rects of the given {key: (width, height)} on shelves.
+
+    Tallest first, each shelf is filled left to right until max_width and the
+    next one starts below the tallest rect of the previous shelf.
+    Returns ({key: (x, y, width, height)}, (sheet_width, sheet_height)).
+    """
+    order = sorted(sizes, key=lambda key: (-sizes[key][1], -sizes[key][0], key))
+    rects = {}
+    x = y = shelf_height = sheet_width = 0
+    for key in order:
+        width, height = sizes[key]
+        if x and x + width > max_width:
+            y += shelf_height + padding # Start a new shelf
+            x = shelf_height = 0
+        rects[key] = (x, y, width, height)
+        x += width + padding
+        shelf_height = max(shelf_height, height)
+        sheet_width = max(sheet_width, x - padding)
+    return rects, (sheet_width, y + shelf_height)
+
+def build_atlas(name, folder, out_dir=ATLAS_PATH, max_width=MAX_WIDTH, padding=PADDING):
+    """Pack every PNG under folder into out_dir/<name>.png and write out_dir/<name>.json.
+
+    The manifest maps each frame key to its rect on the sheet and its pivot
+    (bottom centre of the frame, where a character's feet are) and returns it.
+    """
+    sources = collect_sources(folder)
+    frames = {key: pygame.image.load(path) for key, path in sources.items()}
+    rects, size = pack_shelves({key: frame.get_size() for key, frame in frames.items()}, max_width, padding)
+
+    # Copy the pixels as-is (including alpha) onto a fully transparent sheet
+    sheet = pygame.Surface(size, pygame.SRCALPHA)
+    for key, frame in frames.items():
+        sheet.blit(frame, rects[key][:2], special_flags=pygame.BLEND_RGBA_MAX)
+
+    os.makedirs(out_dir, exist_ok=True)
+    pygame.image.save(sheet, os.path.join(out_dir, f"{name}.png"))
+
+    manifest = {
+        "image": f"{name}.png",
+        "size": list(size),
+        "frames": {
+            key: {
+                "rect": list(rects[key]),
+                "pivot": [rects[key][2] // 2, rects[key][3]],
+                "source": sources[key].replace(os.sep, "/"),
+            }
+            for key in sources
+        },
+    }
+    with open(os.path.join(out_dir, f"{name}.json"), "w") as file:
+        json.dump(manifest, file, indent=2)
+    return manifest
+
+def build_all(out_dir=ATLAS_PATH, max_width=MAX_WIDTH, padding=PADDING):
+    """Build one atlas per character folder plus the UI atlas; return {name: manifest}."""
+    targets = {
+        character: os.path.join(CHARACTERS_PATH, character)
+        for character in sorted(os.listdir(CHARACTERS_PATH))
+        if os.path.isdir(os.path.join(CHARACTERS_PATH, character))
+    }
+    targets[UI_ATLAS] = UI_PATH
+    return {name: build_atlas(name, folder, out_dir, max_width, padding) for name, folder in targets.items()}
+
+# ----------------- Loading -----------------
+def load_atlas(directory, name, prepare):
+    """Return {key: subsurface} for a built atlas, or None if it has not been built.
+
+    The sheet is decoded once (through the surface cache) and passed to
+    prepare (e.g. convert_alpha); every frame is a subsurface sharing its pixels.
+    """
+    manifest_path = os.path.join(directory, f"{name}.json")
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as file:
+        manifest = json.load(file)
+
+    sheet = surface_cache.load_surface(os.path.join(directory, manifest["image"]), prepare)
+    return {key: sheet.subsurface(frame["rect"]) for key, frame in manifest["frames"].items()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack character and UI images into atlases (run from the repository root).")
+    parser.add_argument("-o", "--out", default=ATLAS_PATH, help="output folder (default: assets/images/atlases/)")
+    parser.add_argument("--max-width", type=int, default=MAX_WIDTH, help="widest sheet to build")
+    parser.add_argument("--padding", type=int, default=PADDING, help="pixels between frames")
+    args = parser.parse_args()
+
+    for name, manifest in build_all(args.out, args.max_width, args.padding).items():
+        width, height = manifest["size"]
+        print(f"{name:<8} {len(manifest['frames']):3} frames -> {width}x{height}")
+
+# -------------------- Build Atlases --------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import time
+from collections import deque
+import pygame
+
+# ----------------- Mixer Settings -----------------
+FREQUENCY = 44100 # Output sample rate
+SAMPLE_SIZE = -16 # Signed 16-bit samples
+OUTPUT_CHANNELS = 2 # Stereo
+BUFFER = 512 # Samples per mixing chunk: ~12 ms at 44.1 kHz
+
+# ----------------- Voice Settings -----------------
+# Channels reserved for each category; a full category steals its oldest voice
+VOICES = {
+    "ui": 2,
+    "movement": 2,
+    "weapon": 4,
+    "impact": 4,
+}
+SOUND_CATEGORIES = {
+    "click": "ui",
+    "jump": "movement",
+    "throw": "weapon",
+    "hit": "impact",
+    "block": "impact",
+}
+DEDUPE_MS = 30 # The same sound triggered again within this window is dropped
+LATENCY_SAMPLES = 120 # channel.play() timings kept for latency_estimate()
+
+def pre_init():
+    """Ask for a low-latency mixer. Must run before pygame.init() (see main.py)."""
+    pygame.mixer.pre_init(FREQUENCY, SAMPLE_SIZE, OUTPUT_CHANNELS, BUFFER)
+
+_manager = None # Shared by every screen of the process, created on first use
+
+def get_audio():
+    """Return the process-wide AudioManager, creating it (and its channel pools) on first use."""
+    global _manager
+    if _manager is None:
+        from assets import sounds # Imported late: the mixer must be initialised first
+        _manager = AudioManager(sounds)
+    return _manager
+
+
+class AudioManager:
+    """Plays the game's sound effects through per-category channel pools.
+
+    Every category owns a fixed set of reserved mixer channels, so a burst of
+    shuriken throws can never take the channels the hit or click sounds need.
+    When a category's channels are all busy, its oldest voice is stopped and
+    reused (voice stealing). The same sound triggered again within DEDUPE_MS
+    is dropped, so simultaneous identical events (several hits in one tick,
+    several ticks in one frame) do not stack into one loud burst.
+
+    Sounds are pygame Sound objects, decoded into mixer-format buffers when
+    loaded. Without a mixer (headless runs) play() does nothing.
+    """
+
+    def __init__(self, sounds, voices=VOICES, categories=SOUND_CATEGORIES, dedupe_ms=DEDUPE_MS):
+        self.sounds = sounds # Name -> pygame Sound (e.g. assets.sounds)
+        self.categories = categories
+        self.dedupe_ns = dedupe_ms * 1_000_000
+        self.enabled = pygame.mixer.get_init() is not None
+
+        self.last_played = {} # Sound name -> perf_counter_ns of its last start
+        self.started = {} # Channel index -> perf_counter_ns its current voice started
+        self.trigger_times = deque(maxlen=LATENCY_SAMPLES) # ns spent in each channel.play() call
+        self.stats = {"played": 0, "deduped": 0, "stolen": 0}
+
+        # ----- Reserve one block of channels per category -----
+        self.pools = {}
+        if self.enabled:
+            total = sum(voices.values())
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), total))
+            pygame.mixer.set_reserved(total) # Sound.play() elsewhere never picks these
+            index = 0
+            for category, count in voices.items():
+                self.pools[category] = [(index + i, pygame.mixer.Channel(index + i)) for i in range(count)]
+                index += count
+
+    def play(self, name):
+        """Start a sound by name and return its channel (None if dropped or no mixer)."""
+        if not self.enabled:
+            return None
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+
+        now = time.perf_counter_ns()
+        last = self.last_played.get(name)
+        if last is not None and now - last < self.dedupe_ns:
+            self.stats["deduped"] += 1
+            return None
+
+        index, channel = self.pick_channel(self.pools[self.categories[name]])
+        channel.play(sound)
+
+        self.trigger_times.append(time.perf_counter_ns() - now)
+        self.started[index] = now
+        self.last_played[name] = now
+        self.stats["played"] += 1
+        return channel
+
+    def pick_channel(self, pool):
+        # A free channel of the pool, else steal the one playing the longest
+        for index, channel in pool:
+            if not channel.get_busy():
+                return index, channel
+        self.stats["stolen"] += 1
+        return min(pool, key=lambda entry: self.started.get(entry[0], 0))
+
+    def latency_estimate(self):
+        """Return an estimate (not a measurement) of the trigger-to-output latency in milliseconds.
+
+        trigger: average time the channel.play() calls took, the only part
+        actually timed; buffer: BUFFER samples at the mixer's frequency, i.e.
+        the worst-case wait for the next mixing chunk if the device got the
+        requested buffer size. What the driver and device add on top is not
+        included.
+        """
+        trigger = sum(self.trigger_times) / len(self.trigger_times) / 1_000_000 if self.trigger_times else 0.0
+        init = pygame.mixer.get_init() if self.enabled else None
+        buffer = BUFFER / init[0] * 1000 if init else 0.0
+        return {"trigger": trigger, "buffer": buffer, "total": trigger + buffer}
+
+    def stop_all(self):
+        """Silence every voice of every category."""
+        for pool in self.pools.values():
+            for _, channel in pool:
+                channel.stop()
@@ -1,26 +1,39 @@
 import pygame 
 import sys
+import time
+import random
 import button
-import player
-import enemy
-from assets import images, sounds  # Import centralized assets
+import simulation
+import renderer
+import profiler
+import frame_export
+import replay
+import audio
+from assets import images, preload_scene  # Import centralized assets
 
 # ----------------- Game Settings -----------------
 SCREEN_WIDTH = 1000
 SCREEN_HEIGHT = 600
-FPS = 60
+FPS = 120 # Render frame-rate cap; the simulation always runs at TICK_RATE
+PAUSED_FPS = 30 # The pause menu only has to follow the mouse
+TICK_RATE = 60 # Fixed simulation ticks per second
+TICK_NS = 1_000_000_000 // TICK_RATE # Length of one tick in nanoseconds
+MAX_FRAME_SKIP = 5 # Max ticks simulated per rendered frame before the game is allowed to slow down
+DIRTY_RECTS = False # Redraw only the areas that changed (for low-power hardware)
 
 class Battle:
     
-    def __init__(self):
+    def __init__(self, dirty_rects=DIRTY_RECTS, replay=None):
         # Initialize Pygame and set up display
         pygame.init()
         self.battle_screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.surface=pygame.Surface((SCREEN_WIDTH,SCREEN_HEIGHT),pygame.SRCALPHA)
-        pygame.display.set_caption("Shinobi Saga - Battle")
+        self.surface.fill((128,128,128,150)) # Semi-transparent gray pause overlay
+        pygame.display.set_caption("Shinobi Saga - Replay" if replay else "Shinobi Saga - Battle")
         self.clock = pygame.time.Clock()
         
         # ----------------- Load Assets -----------------
+        preload_scene("battle") # Usually already done in the background from the menu
         self.bg = images["bg"]
         self.pause_menu = images["pause_menu"]
         self.pause_img = images["pause"]
@@ -31,9 +44,8 @@ class Battle:
         self.naruto_win = images["naruto_win"]
         self.sasuke_win = images["sasuke_win"]
         
-        # ----------------- Load Sound -----------------
-        self.click = sounds["click"]
-        self.hit_sound = pygame.mixer.Sound("assets/sounds/hit.wav")
+        # ----------------- Sound -----------------
+        self.audio = audio.get_audio() # Shared sound manager (channel pools per category)
         
         # ----------------- Buttons -----------------
         self.pause_button=button.Button(478,5,self.pause_img,0.7)
@@ -42,169 +54,230 @@ class Battle:
         self.exit_button=button.Button(400,355,self.exit_img,1)
         self.home_button=button.Button(465,450,self.home_img,1)
         
-    def run_game(self):
-        # ----------------- Game State Flags -----------------
-        self.running = True
-        self.paused = False
-        self.restart=False
+        # ----------------- Renderer -----------------
+        renderer_class = renderer.DirtyRectRenderer if dirty_rects else renderer.FullRenderer
+        self.renderer = renderer_class(self.battle_screen, self.bg)
         
-        # ----------------- Create Characters -----------------
-        self.naruto = player.Character(10, 510)
-        self.sasuke = enemy.Enemy(890,510)
+        # ----------------- Profiler -----------------
+        self.profiler = profiler.get_profiler() # FrameProfiler when SHINOBI_PROFILE is set, else None
         
-        # -------- Game Loop --------
-        while self.running:
-            self.clock.tick(FPS)
+        # ----------------- Frame Export -----------------
+        self.exporter = frame_export.get_exporter((SCREEN_WIDTH, SCREEN_HEIGHT)) # FrameExporter when SHINOBI_EXPORT is set, else None
+        
+        # ----------------- Replays -----------------
+        self.replay = replay # replay.Replay to show instead of reading the keyboard
+        self.recording = None # replay.Replay of the current round when SHINOBI_REPLAYS is set
+        
+    def run_game(self):
+        # ----------------- Create Match (fighters & rules) -----------------
+        self.match = simulation.Match(headless=False, seed=0) # Reseeded for every round
+        self.naruto = self.match.naruto
+        self.sasuke = self.match.sasuke
+        self.round_start = self.match.snapshot() # State every restart goes back to
+        if self.profiler:
+            self.profile_phases()
+        
+        # -------- Match Lifecycle: play rounds until no restart is requested --------
+        self.restart = True
+        while self.restart:
+            # Reset fighters, health, shurikens and timers, and start the round's random stream
+            self.match.restore(self.round_start, rng=False)
+            seed = self.replay.seed if self.replay else random.getrandbits(32)
+            self.match.reseed(seed)
             
-            # Draw Background
-            self.battle_screen.blit(self.bg, (0, 0))
+            # Inputs of the round: read back from the replay, or recorded (seed + input per tick)
+            self.replay_inputs = self.replay.masks() if self.replay else None
+            if replay.replay_dir() and not self.replay:
+                self.recording = replay.Replay(seed, tick_rate=TICK_RATE)
             
-            # Draw Pause Button & check Click
-            if self.pause_button.draw(self.battle_screen) :
-                self.paused=True
-                self.click.play()
+            # ----------------- Game State Flags -----------------
+            self.running = True
+            self.paused = False
+            self.restart = False
             
-            # Character Logic (movement, attacks, shuriken updates)
-            self.handle_character_logic(self.naruto, self.sasuke, is_player=True)
-            self.handle_character_logic(self.sasuke, self.naruto, is_player=False)
+            try:
+                self.play_round()
+            finally:
+                self.save_recording() # Also when the game is closed mid-round
+    
+    def play_round(self):
+        """Runs the game loop until the round is left (home, restart or exit)."""
+        self.renderer.reset()
+        self.accumulator = 0 # Real time not yet simulated, in nanoseconds
+        self.last_time = time.perf_counter_ns()
+        while self.running:
+            self.clock.tick(PAUSED_FPS if self.paused else FPS)
+            
+            # Real time elapsed since the previous frame
+            now = time.perf_counter_ns()
+            self.frame_time = now - self.last_time
+            self.last_time = now
             
-            # -------- Pause Menu --------
+            # -------- Pause Menu over the frozen frame, or one battle frame --------
             if self.paused:
-                self.pause_game() # Render the semi-transparent overlay and pause menu UI
-                
-                #Check if Resume button is clicked
-                if self.resume_button.draw(self.battle_screen):
-                    self.paused=False  # Unpause the game and resume
-                
-                # Check if Restart button is clicked
-                if self.restart_button.draw(self.battle_screen):
-                    self.restart_game() # Restart the game state and loop
-                
-                # Check if Exit button is clicked
-                if self.exit_button.draw(self.battle_screen):
-                    self.running=False # Stop the game loop
-                    pygame.quit() # Quit Pygame
-                    sys.exit() # Exit the application completely
-                
-                # Check if Home button is clicked
-                if self.home_button.draw(self.battle_screen):
-                    self.running=False
-
-            # -------- Handle Quit Event --------
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                self.pause_menu_frame()
+            else:
+                self.battle_frame()
 
-            # Update display
-            pygame.display.flip()
+            self.handle_events()
         
-        # Restart game loop if restart triggered
-        if self.restart:
-            self.run_game()
+        # Hits and throws still ringing must not carry over to the menu or the next round
+        self.audio.stop_all()
     
-    def handle_character_logic(self, character, opponent, is_player=True):
-        """ Handles movement, shuriken updates, physics, health, and state. """
-        
-        # Only update if character is alive and game is not paused
-        if character.health_bar.health > 0 and not self.paused:
-            if opponent.health_bar.health > 0:
-                # If character is player-controlled, handle keyboard input
-                if is_player:
-                    character.handle_input(pygame.key.get_pressed())
-                else:
-                    # If character is enemy-controlled, run enemy movement logic
-                    character.move_enemy()
-            else:
-                # Opponent is defeated, current character becomes winner
-                character.state = "winner"
-                self.game_over("naruto" if is_player else "sasuke") # Display win banner
-            
-        # If character's health is zero or below
-        elif character.health_bar.health <= 0:
-            # Only change to defeated state once (prevents re-triggering every frame)
-            if character.state != "defeated":
-                character.state = "defeated"
-                character.frame = 0  # Reset defeated animation frame
-
-        else:
-            # Character is idle (e.g. paused or waiting)
-            character.state = "stand"
-
-        # Apply gravity and physics (jumping, falling)
-        character.apply_physics()
+    def handle_events(self):
+        """Handles the quit event (and the profiler overlay key when profiling)."""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.KEYDOWN and event.key == profiler.TOGGLE_KEY and self.profiler:
+                self.profiler.toggle_overlay()
+    
+    def profile_phases(self):
+        """Times each phase of a battle frame with the profiler (only done when profiling)."""
+        prof = self.profiler
+        prof.instrument(self, "handle_events", "events")
+        prof.instrument(self.match, "step", "simulate")
+        prof.instrument(self.naruto, "handle_input", "input")
+        prof.instrument(self.sasuke, "move_enemy", "enemy_ai")
+        for fighter in (self.naruto, self.sasuke):
+            prof.instrument(fighter, "apply_physics", "physics")
+            prof.instrument(fighter, "update_animation", "animation")
+            prof.instrument(fighter, "update_shurikens", "shurikens")
+        prof.instrument(self.match, "check_damage", "damage")
+        prof.instrument(self, "draw_character", "draw")
+        for fighter in (self.naruto, self.sasuke):
+            prof.instrument(fighter, "display_health", "hud")
+        prof.instrument(self.renderer, "end_frame", "flip")
+        if self.exporter and "export" not in vars(self.exporter): # Shared by every battle: wrap it once
+            prof.instrument(self.exporter, "export", "export")
+    
+    def battle_frame(self):
+        """Advances the match by the ticks due since the last frame and renders it."""
+        
+        # Draw Background
+        self.renderer.begin_frame()
         
-        # Draw the character with current animation frame
-        character.draw(self.battle_screen)
+        # Draw Pause Button & check Click
+        if self.pause_button.draw(self.battle_screen) :
+            self.paused=True
+            self.audio.play("click")
+        self.renderer.mark(self.pause_button.rect)
         
-        # Update and draw shurikens if game is not paused
+        # Advance the simulation at the fixed tick rate (not once paused)
         if not self.paused:
-            character.update_shurikens(self.battle_screen)
+            self.run_ticks()
         
-        # Draw health bar
-        character.display_health(self.battle_screen)
+        # Draw both fighters, their shurikens and health bars between the last two ticks
+        alpha = self.accumulator / TICK_NS
+        self.draw_character(self.naruto, alpha)
+        self.draw_character(self.sasuke, alpha)
         
-        # Check if character's shuriken hit the opponent
-        self.check_damage(character, opponent,is_player)
-
-    def check_damage(self, attacker, target, is_player):
-        """Checks if any of the attacker's shurikens hit the target 
-        and applies damage or effects."""
+        # Display win banner once a winner is decided
+        if self.match.winner:
+            self.game_over(self.match.winner)
         
-        # Loop through a copy of the attacker's shuriken list to avoid mutation during iteration
-        for shuriken in attacker.shurikens[:]:
-            
-            # Check if the current shuriken collides with the target's rectangle
-            if shuriken.rect.colliderect(target.rect):
-                
-                # Check if target is not blocking (based on player/enemy logic)
-                if not self.check_block(is_player,target): 
-                    
-                    # Determine type of damage based on shuriken's damage value
-                    if shuriken.damage == 10:
-                        target.state = "small_damage" # Light hit animation
-                    else:
-                        target.state = "big_damage" # Heavy hit animation
-                    
-                    # Set hit flag and reset animation frame for smooth transition
-                    target.is_hit = True
-                    target.frame = 0
-                
-                # Remove the shuriken after collision (whether it caused damage or was blocked)
-                attacker.shurikens.remove(shuriken)
-                
-                # Play hit sound effect
-                self.hit_sound.play()
-                
-    def check_block(self,is_player,target):
-        """Checks if the target is currently blocking and 
-        whether the block is successful or broken."""
-        
-        # If the target is the enemy (not the player)
-        if not is_player:
-            if target.state == "block" :
-                target.block_count += 1 # Increase block count each time enemy blocks
-                
-                # Enemy can block only 2 times consecutively
-                if target.block_count > 2:
-                    target.health_bar.player_hit() #Take damage if block limit exceeded
-                    return False  # Block failed
-                
-                return True  # Block successful
+        # Freeze this frame under the pause overlay
+        if self.paused:
+            self.pause_game()
+        
+        # Hand the composed frame to external readers (without the profiler overlay)
+        if self.exporter:
+            self.exporter.export(self.battle_screen)
+        
+        # Profiler overlay (F3) on top of everything
+        if self.profiler:
+            self.renderer.mark_all(self.profiler.draw_overlay(self.battle_screen))
+        
+        # Update display
+        self.renderer.end_frame()
+        if self.profiler:
+            self.profiler.end_frame()
+    
+    def pause_menu_frame(self):
+        """Redraws only the pause menu buttons on top of the frozen paused frame,
+        and only when the mouse hovers another button or is pressed/released."""
+        buttons = (self.resume_button, self.restart_button, self.exit_button, self.home_button)
+        
+        # Nothing can look or act differently while the mouse state is unchanged
+        mouse_pos = pygame.mouse.get_pos()
+        pause_state = (tuple(menu_button.rect.collidepoint(mouse_pos) for menu_button in buttons),
+                       pygame.mouse.get_pressed()[0])
+        if pause_state == self.pause_state:
+            if self.profiler:
+                self.profiler.skip_frame()
+            return
+        self.pause_state = pause_state
+        
+        # Restore the frozen frame under the buttons (their hover look may change)
+        for menu_button in buttons:
+            self.battle_screen.blit(self.paused_frame, menu_button.rect, menu_button.rect)
+        
+        #Check if Resume button is clicked
+        if self.resume_button.draw(self.battle_screen):
+            self.paused=False  # Unpause the game and resume
+            self.renderer.reset() # Next battle frame redraws the whole scene
+        
+        # Check if Restart button is clicked
+        if self.restart_button.draw(self.battle_screen):
+            self.restart_game() # Restart the game state and loop
+        
+        # Check if Exit button is clicked
+        if self.exit_button.draw(self.battle_screen):
+            self.running=False # Stop the game loop
+            self.audio.stop_all() # Silence the battle before the mixer goes away
+            pygame.quit() # Quit Pygame
+            sys.exit() # Exit the application completely
+        
+        # Check if Home button is clicked
+        if self.home_button.draw(self.battle_screen):
+            self.running=False
+        
+        pygame.display.update([menu_button.rect for menu_button in buttons])
+        
+        # Paused frames are left out of the profile (and of the next frame's time)
+        if self.profiler:
+            self.profiler.skip_frame()
+    
+    def run_ticks(self):
+        """Runs every simulation tick due since the last frame with the current keyboard state.
 
-            # If not blocking, take damage
-            if target.state != "block" :
-                target.health_bar.player_hit()
-                return False
-            
-        else:
-            # For Enemy, increase hit count (used to track when to reset block)
-            target.hit_count += 1 
-            if target.state != "block" :
-                target.health_bar.enemy_hit() # Take damage
-                return False # Block failed
-            
-            return True # Block successful
+        Ticks run at TICK_RATE whatever the frame rate: a slow frame runs several
+        ticks (skipping the renders in between), a fast one may run none. Beyond
+        MAX_FRAME_SKIP ticks the backlog is dropped so the game slows down
+        instead of freezing.
+        """
+        inputs = simulation.keys_to_mask(pygame.key.get_pressed())
+        self.accumulator += self.frame_time
+        
+        ticks = 0
+        while self.accumulator >= TICK_NS and ticks < MAX_FRAME_SKIP:
+            if self.replay_inputs is not None:
+                inputs = next(self.replay_inputs, 0) # Idle once the recording ran out
+            elif self.recording:
+                self.recording.record(inputs)
+            for event in self.match.step(inputs):
+                self.audio.play(event)
+            self.accumulator -= TICK_NS
+            ticks += 1
+        
+        # Too far behind: forget the time that could not be simulated
+        if self.accumulator >= TICK_NS:
+            self.accumulator %= TICK_NS
+    
+    def save_recording(self):
+        """Saves the round just played as a replay file (when recording)."""
+        if self.recording and self.recording.ticks:
+            self.recording.finish(self.match)
+            self.recording.save_to(replay.replay_dir())
+        self.recording = None
+    
+    def draw_character(self, character, alpha=1.0):
+        """Draws a character, its shurikens and its health bar.
+        alpha interpolates positions between the previous (0) and current (1) tick."""
+        self.renderer.mark(character.draw(self.battle_screen, alpha))
+        self.renderer.mark_all(character.draw_shurikens(self.battle_screen, alpha))
+        self.renderer.mark(character.display_health(self.battle_screen))
 
     def game_over(self,winner):
         """Displays the winning banner and handles game over options like restart or exit."""
@@ -212,7 +285,7 @@ class Battle:
         # Select winning banner based on the winner character
         self.result= self.naruto_win if winner == "naruto" else self.sasuke_win
         
-        self.battle_screen.blit(self.result,(300,100)) # Show the banner on screen
+        self.renderer.mark(self.battle_screen.blit(self.result,(300,100))) # Show the banner on screen
         
         # Show buttons for restart, exit, etc.
         if self.restart_button.draw(self.battle_screen):
@@ -220,29 +293,27 @@ class Battle:
         
         if self.exit_button.draw(self.battle_screen) :
             self.running=False
+            self.audio.stop_all()
             pygame.quit()
             sys.exit()
+        
+        self.renderer.mark_all((self.restart_button.rect, self.exit_button.rect))
 
     def pause_game(self):
-        """Draws a translucent overlay with the pause menu UI."""
-        
-        # Draw a semi-transparent gray overlay
-        pygame.draw.rect(self.surface,(128,128,128,150),[0,0,SCREEN_WIDTH,SCREEN_HEIGHT])
+        """Draws a translucent overlay with the pause menu UI over the current frame, once,
+        and keeps the result so paused frames only have to redraw the menu buttons."""
         
         # Blit the overlay and pause menu onto the main screen
         self.battle_screen.blit(self.surface,(0,0))
         self.battle_screen.blit(self.pause_menu,(290,50))
+        self.renderer.invalidate() # The overlay covers the whole screen
         
-    def restart_game(self):
-        """Resets all game elements to their initial state to restart the battle."""
+        # Frozen frame shown for as long as the game stays paused
+        self.paused_frame = self.battle_screen.copy()
+        self.pause_state = None # Mouse state the buttons were last drawn for (None: draw them)
         
-        # Reset win counters
-        self.naruto.count=0
-        self.sasuke.count=0
-        
-        # Clear all active shurikens
-        self.naruto.shurikens = []
-        self.sasuke.shurikens = []
+    def restart_game(self):
+        """Requests a restart: run_game restores the round start snapshot and plays again."""
         
         # Set restart and unpause
         self.restart=True
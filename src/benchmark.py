@@ -0,0 +1,279 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Headless by default: no window, no sound device (must be set before pygame starts)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+# ----------------- Benchmark Settings -----------------
+SCREEN_SIZE = (1000, 600)
+DEFAULT_REPEATS = 5 # Runs per measurement; the median is reported
+DEFAULT_THRESHOLD = 0.15 # Relative slowdown flagged as a regression by --compare
+MATCH_TICKS = 20_000 # Ticks simulated for the scripted match benchmark
+SHURIKEN_COUNTS = (10, 100, 1000, 5000) # Shurikens in flight (per fighter) for the scaling benchmark
+RENDER_COUNTS = (1, 6, 500) # Shurikens on screen (per fighter) for the render benchmark
+RENDER_FRAMES = 300 # Frames rendered per render measurement
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def metric(value, unit, better):
+    """One benchmark result; better is "lower" or "higher"."""
+    return {"value": round(value, 4), "unit": unit, "better": better}
+
+def median_time(function, repeats, warmup=True):
+    """Median wall time of function() over repeats runs, in seconds.
+    With warmup, one untimed run comes first (caches, allocator, CPU clocks)."""
+    if warmup:
+        function()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def init_display():
+    # Surfaces are converted to the display format like in the game
+    pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode(SCREEN_SIZE)
+
+# ----------------- Startup -----------------
+STARTUP_SCRIPT = """
+import sys, time
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+import pygame
+pygame.init()
+pygame.display.set_mode({size!r})
+loaded = time.perf_counter()
+import assets
+imported = time.perf_counter()
+assets.preload_scene("menu")
+menu = time.perf_counter()
+import main
+ready = time.perf_counter()
+assets.preload_scene("battle")
+battle = time.perf_counter()
+print(loaded - start, imported - loaded, menu - imported, battle - ready, ready - start)
+"""
+
+def run_startup(script, cache):
+    # One fresh interpreter with the given surface cache directory
+    env = dict(os.environ, SHINOBI_CACHE=cache)
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True, env=env).stdout
+    return tuple(map(float, output.split()[-5:]))
+
+def bench_startup(repeats):
+    """pygame start-up, assets.py import (lazy: loads nothing), loading the menu
+    scene, loading the battle scene after it (as the game does) and time until
+    the main menu is ready, each in a fresh process, with an empty (cold) and a
+    filled (warm) surface cache. pygame.init alone takes about 260 ms here, so
+    main_menu stays above the 200 ms target even with a warm cache."""
+    script = STARTUP_SCRIPT.format(src=SRC_DIR, size=SCREEN_SIZE)
+    with tempfile.TemporaryDirectory() as scratch:
+        cold = [run_startup(script, os.path.join(scratch, f"cold{run}")) for run in range(repeats)]
+        warm_cache = os.path.join(scratch, "warm")
+        run_startup(script, warm_cache) # Fill it
+        warm = [run_startup(script, warm_cache) for _ in range(repeats)]
+
+    def median_ms(runs, column):
+        return statistics.median(run[column] for run in runs) * 1000
+
+    return {
+        "startup.pygame_init": metric(median_ms(warm, 0), "ms", "lower"),
+        "startup.import_assets": metric(median_ms(warm, 1), "ms", "lower"),
+        "startup.preload_menu_cold": metric(median_ms(cold, 2), "ms", "lower"),
+        "startup.preload_menu": metric(median_ms(warm, 2), "ms", "lower"),
+        "startup.preload_battle_cold": metric(median_ms(cold, 3), "ms", "lower"),
+        "startup.preload_battle": metric(median_ms(warm, 3), "ms", "lower"),
+        "startup.main_menu_cold": metric(median_ms(cold, 4), "ms", "lower"),
+        "startup.main_menu": metric(median_ms(warm, 4), "ms", "lower"),
+    }
+
+# ----------------- Fighter Construction -----------------
+def bench_fighters(repeats):
+    """Building Naruto and Sasuke: the first pair loads their sprites, later ones reuse them."""
+    init_display()
+    import player
+    import enemy
+
+    def build():
+        player.Character(10, 510)
+        enemy.Enemy(890, 510)
+
+    first = median_time(build, 1, warmup=False)
+    warm = median_time(build, repeats)
+    return {
+        "fighters.first_construction": metric(first * 1000, "ms", "lower"),
+        "fighters.construction": metric(warm * 1_000_000, "us", "lower"),
+    }
+
+# ----------------- Simulation -----------------
+def bench_match(repeats, ticks=MATCH_TICKS):
+    """Ticks per second of seeded headless matches played by the scripted player."""
+    import simulation
+
+    def play():
+        seed, played = 0, 0
+        while played < ticks:
+            match = simulation.Match(headless=True, seed=seed)
+            bot = simulation.ScriptedPlayer(seed)
+            while not match.is_over and played < ticks:
+                match.step(bot(match))
+                played += 1
+            seed += 1
+
+    return {"simulation.ticks_per_second": metric(ticks / median_time(play, repeats), "ticks/s", "higher")}
+
+def fill_shurikens(match, count):
+    # Spread shurikens over the arena, both fighters throwing towards each other
+    for fighter, facing_right in ((match.naruto, True), (match.sasuke, False)):
+        fighter.max_shurikens = max(fighter.max_shurikens, count)
+        pool = fighter.shurikens
+        index = len(pool)
+        while len(pool) < count:
+            pool.acquire((index * 997) % 1000, 300 + (index * 61) % 220, facing_right, index % 4 == 0)
+            index += 1
+
+def bench_shurikens(repeats, counts=SHURIKEN_COUNTS, steps=50):
+    """Cost of one simulation tick with count shurikens per fighter in flight (kept topped up)."""
+    import simulation
+    results = {}
+    for count in counts:
+        match = simulation.Match(headless=True, seed=0)
+
+        def run():
+            for _ in range(steps):
+                fill_shurikens(match, count)
+                match.step(0)
+                match.naruto.health_bar.health = match.sasuke.health_bar.health = 200 # Keep both fighting
+
+        per_tick = median_time(run, repeats) / steps
+        results[f"shurikens.tick_{count}"] = metric(per_tick * 1_000_000, "us", "lower")
+        results[f"shurikens.per_shuriken_{count}"] = metric(per_tick * 1_000_000_000 / (2 * count), "ns", "lower")
+    return results
+
+# ----------------- Rendering -----------------
+def bench_render(repeats, counts=RENDER_COUNTS, frames=RENDER_FRAMES):
+    """Battle frames per second (drawing only, no ticks) with count shurikens per fighter on screen."""
+    init_display()
+    import battle
+    import simulation
+
+    results = {}
+    for dirty_rects in (False, True):
+        game = battle.Battle(dirty_rects=dirty_rects)
+        game.match = simulation.Match(headless=False, seed=0)
+        game.naruto, game.sasuke = game.match.naruto, game.match.sasuke
+        game.paused = False
+        game.renderer.reset()
+        game.accumulator = game.frame_time = 0 # No time passes, so frames only render
+
+        for count in counts:
+            for fighter in (game.naruto, game.sasuke):
+                fighter.shurikens.clear()
+            fill_shurikens(game.match, count)
+
+            def render():
+                for _ in range(frames):
+                    game.battle_frame()
+
+            name = "dirty" if dirty_rects else "full"
+            fps = frames / median_time(render, repeats)
+            results[f"render.{name}_fps_{count}"] = metric(fps, "fps", "higher")
+    return results
+
+# ----------------- Suite -----------------
+BENCHMARKS = {
+    "startup": bench_startup,
+    "fighters": bench_fighters,
+    "match": bench_match,
+    "shurikens": bench_shurikens,
+    "render": bench_render,
+}
+
+def run_suite(names=None, repeats=DEFAULT_REPEATS):
+    """Run the selected benchmarks (all by default) and return the results document."""
+    results = {}
+    for name in names or BENCHMARKS:
+        results.update(BENCHMARKS[name](repeats))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Compare two results documents; return (rows, regressions).
+
+    Each row is (name, baseline value, current value, relative change) where a
+    positive change means slower/worse. Metrics worse by more than threshold
+    are regressions.
+    """
+    rows, regressions = [], []
+    for name, current in results["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or not base["value"]:
+            continue
+        change = (current["value"] - base["value"]) / base["value"]
+        if current["better"] == "higher":
+            change = -change
+        rows.append((name, base["value"], current["value"], change))
+        if change > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+def print_results(results):
+    for name, result in results["results"].items():
+        print(f"{name:<32} {result['value']:>14.2f} {result['unit']}")
+
+def print_comparison(rows, regressions):
+    print(f"{'metric':<32} {'baseline':>14}    {'current':>14}  {'worse by':>7}")
+    for name, base, current, change in rows:
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<32} {base:>14.2f} -> {current:>14.2f}  {change:+8.1%}{flag}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmarks for startup, assets, simulation and rendering.")
+    parser.add_argument("-o", "--output", metavar="PATH", help="write the results as JSON")
+    parser.add_argument("-c", "--compare", metavar="BASELINE", help="compare against a results JSON file")
+    parser.add_argument("-t", "--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown counted as a regression (default: 0.15)")
+    parser.add_argument("-r", "--repeats", type=int, default=DEFAULT_REPEATS, help="runs per measurement")
+    parser.add_argument("-b", "--only", nargs="+", choices=list(BENCHMARKS), help="run only these benchmarks")
+    args = parser.parse_args()
+
+    results = run_suite(args.only, args.repeats)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        rows, regressions = compare(results, baseline, args.threshold)
+        print()
+        print_comparison(rows, regressions)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+
+# -------------------- Start Benchmarks --------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# ----------------- Broad Phase Settings -----------------
+CELL_SIZE = 64 # Grid cell size in pixels (a shuriken or hitbox spans at most a few cells)
+
+class SpatialGrid:
+    """Uniform grid broad phase over axis-aligned rects.
+
+    Rects are bucketed into every cell they overlap, so finding what may touch
+    a rect only looks at its own cells and building the grid is linear in the
+    number of rects. Results are candidates (same cell) to be confirmed with an
+    exact test such as Rect.colliderect.
+    """
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {} # (cell_x, cell_y) -> indices of the rects overlapping that cell
+        self.items = [] # Inserted objects, by index
+        self.rects = [] # Their rects, by index
+
+    def clear(self):
+        """Remove everything so the grid can be refilled for the next tick."""
+        self.cells.clear()
+        self.items.clear()
+        self.rects.clear()
+
+    def _cells(self, rect):
+        # Every cell the rect overlaps
+        size = self.cell_size
+        for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield cell_x, cell_y
+
+    def insert(self, item, rect):
+        """Index an object by its rect and return its index."""
+        index = len(self.items)
+        self.items.append(item)
+        self.rects.append(rect)
+        for cell in self._cells(rect):
+            bucket = self.cells.get(cell)
+            if bucket is None:
+                self.cells[cell] = [index]
+            else:
+                bucket.append(index)
+        return index
+
+    def query(self, rect):
+        """Return the indices (in insertion order) of objects sharing a cell with rect."""
+        found = set()
+        for cell in self._cells(rect):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return sorted(found)
+
+# ----------------- Swept (Continuous) Collision -----------------
+def _axis_interval(start, size, delta, low, high):
+    # Open time interval during which [start, start + size) + t * delta overlaps (low, high)
+    if delta == 0:
+        if low - size < start < high:
+            return float("-inf"), float("inf")
+        return None
+    enter = (low - size - start) / delta
+    leave = (high - start) / delta
+    return (enter, leave) if enter < leave else (leave, enter)
+
+def sweep_rect(moving, dx, dy, target):
+    """Return the time of impact of a rect moving by (dx, dy) against a static rect, or None.
+
+    moving is the rect at the start of the move (t = 0) and it ends at t = 1.
+    The result is the first t in [0, 1] at which the two rects overlap, with
+    Rect.colliderect semantics (touching edges do not count), so anything the
+    discrete test finds at the end position is also found here, plus every
+    overlap the rect passed through on the way.
+    """
+    x_interval = _axis_interval(moving.x, moving.width, dx, target.left, target.right)
+    if x_interval is None:
+        return None
+    y_interval = _axis_interval(moving.y, moving.height, dy, target.top, target.bottom)
+    if y_interval is None:
+        return None
+
+    enter = max(x_interval[0], y_interval[0])
+    leave = min(x_interval[1], y_interval[1])
+    if enter < leave and enter < 1 and leave > 0:
+        return max(enter, 0.0)
+    return None
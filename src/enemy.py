@@ -1,19 +1,35 @@
 import pygame 
-from shuriken import Shuriken # Import the Shuriken class for enemy to throw
+from shuriken import ShurikenPool, SPEED as SHURIKEN_SPEED # Shuriken pool for the enemy to throw from
 import random
 from health import HealthBar # Import custom HealthBar class for visual health display
-from assets import images, sounds, load_animation , load_character # Centralized asset import
+from assets import get_character_assets, ANIMATION_FRAMES, FRAME_SCALE # Centralized asset import
 
 
 class Enemy:
     
-    def __init__(self, x, y):
-        """ Initialize the enemy character with position, state, animations, and health. """
+    # Per-tick state captured by Match.snapshot (everything else is constant or derived)
+    SNAPSHOT_FIELDS = (
+        "x", "y", "vel_y", "is_jumping", "on_ground", "facing_right", "is_throwing",
+        "is_big", "is_hit", "state", "frame", "throw_timer", "hit_count",
+    )
+    
+    def __init__(self, x, y, headless=False, rng=None):
+        """ Initialize the enemy character with position, state, animations, and health.
+        
+        A headless enemy skips all sprite loading and can only be simulated.
+        rng is the random source for its random choices (defaults to the
+        global random module); pass a seeded random.Random for reproducible matches.
+        """
+        
+        self.name = "sasuke" # Character name used in match stats
+        self.rng = rng if rng is not None else random # Source of random choices
         
         # ----- Position and Physics Settings -----
         self.x = x  # X coordinate (horizontal position)
         self.y = y  # Y coordinate (vertical position)
         self.constant_y = y # Base/ground Y position used for resetting jump
+        self.prev_x = x # Position at the start of the last tick (for render interpolation)
+        self.prev_y = y
         self.vel_x = 5  # Speed of horizontal movement
         self.vel_y = 0  # Initial vertical velocity (used for jumping)
         self.gravity = 1  # Gravity effect on jumping
@@ -25,71 +41,58 @@ class Enemy:
         self.on_ground = True  # Flag to check if on the ground
         self.facing_right = True  # Direction the character is facing
         self.is_throwing = False  # Is currently in throw animation
-        self.shurikens = []  # List to store thrown shuriken objects
+        self.shurikens = ShurikenPool()  # Thrown shurikens in flight (reused between throws)
+        self.max_shurikens = 6 # Max shurikens in flight at once
+        self.shuriken_speed = SHURIKEN_SPEED # Pixels per tick of thrown shurikens
         self.is_big=False # Whether next shuriken is big
         self.is_hit = False # True if recently hit
         
         # ----- Animation Control -----
         self.state = "stand"  # Initial animation state
-        self.frame = 0  # Frame index for animations
+        self.frame = 0  # Animation position, in 1/FRAME_SCALE frames
         self.throw_timer = 0  # Timer to manage shuriken throw cooldown
         self.jump_chance = 0.03 # Small chance to jump every frame
         self.throw_chance = 0.03  # Small chance to Throw every frame
         self.throw_duration = 30  # Frames the throw lasts (~0.5 sec at 60 FPS)
         self.hit_count=0
+        self.events = [] # Sound events ("throw", "jump") raised this tick
+        self.rect = pygame.Rect(self.x+10, self.y+5,80,85) # Hitbox for collision
 
         # ----- Health and UI -----
-        self.icon = images.get("sasuke_head")
+        # Sprites and head icon come from the shared registry, loaded once per process
+        assets = {} if headless else get_character_assets("sasuke")
+        self.icon = assets.get("icon") # Character head icon for health bar
         self.health_bar=HealthBar(self.icon,self.x,self.y) # Create health bar instance
 
-        # ----- Load Static Images -----
-        self.images = {
-            "stand": load_character("sasuke", "stand"),
-            "block": load_character("sasuke","guard"),
-            "small_damage": load_character("sasuke","small_damage"),
-            "big_damage": load_character("sasuke","big_damage"),
-            "winner": load_character("sasuke","winner"),
-        }
-        
-        # ----- Load Animations -----
-        self.animations = {
-            "run": load_animation("sasuke", "run", 6),
-            "jump": load_animation("sasuke", "jump", 4),
-            "throw": load_animation("sasuke", "throw", 3),
-            "defeated": load_animation("sasuke","defeated",3),
-        }
-        
-        # ----- Load Sounds -----
-        self.jump_sound = sounds.get("jump")
-        self.throw_sound = sounds.get("throw")
-        self.block_sound= sounds.get("block")
+        # ----- Sprites for both facing directions -----
+        self.sprites = assets.get("sprites", {})
 
     def jump(self):
         """ Trigger jump action with upward velocity and sound. """
         self.is_jumping = True
         self.on_ground = False
         self.vel_y = -15  # Jump strength
-        self.jump_sound.play()
+        self.events.append("jump")
     
     def throw_shuriken(self):
         """ Trigger throw action and create a new shuriken if conditions are met. """
         
         if not self.is_throwing :  # Only throw if not already throwing
-            self.throw_sound.play()
+            self.events.append("throw")
             self.state = "throw"
             self.is_throwing = True
             self.throw_timer = self.throw_duration
-            self.is_big = True if random.randint(1,10) == 1 else False 
+            self.is_big = True if self.rng.randint(1,10) == 1 else False 
             
-            if len(self.shurikens) < 6 : 
-                # Create a new shuriken and add it to the list
-                new_shuriken = Shuriken(
+            if len(self.shurikens) < self.max_shurikens : 
+                # Throw a shuriken from the pool
+                self.shurikens.acquire(
                     self.x + 60 if self.facing_right else self.x + 20, 
                     self.y, 
                     self.facing_right,
-                    self.is_big
+                    self.is_big,
+                    self.shuriken_speed
                     )
-                self.shurikens.append(new_shuriken)
 
                 # Reset hit count after attack
                 self.hit_count = 0
@@ -156,11 +159,11 @@ class Enemy:
 
 
         # -------- Random Jump --------
-        if self.on_ground and random.random() < self.jump_chance and not self.is_hit:
+        if self.on_ground and self.rng.random() < self.jump_chance and not self.is_hit:
             self.jump()
         
         # -------- Random Throw --------
-        if not self.is_throwing and random.random() < self.throw_chance :
+        if not self.is_throwing and self.rng.random() < self.throw_chance :
             self.throw_shuriken()
         
         # -------- Switch to block if recently hit and grounded --------
@@ -170,29 +173,26 @@ class Enemy:
         self.apply_physics()
     
     def update_animation(self):
-        """Return the correct animation frame based on the current state."""
+        """Advance the animation frame counter and timed state changes by one tick."""
         
         # -------- Static States (single frame) --------
         if self.state in ["stand","block","winner"]:
-            image = self.images[self.state]
             self.frame = 0
         
         # ---- Damage Reaction Frames ----
         elif self.state in ["small_damage", "big_damage"]:
-            image = self.images[self.state]
-            self.frame +=1
-            if self.frame > 10:  # Show damage image for ~10 frames
+            self.frame += FRAME_SCALE
+            if self.frame > 10 * FRAME_SCALE:  # Show damage image for ~10 frames
                 self.is_hit=False
                 self.frame = 0
 
         # -------- Defeated Animation (multi-frame + step back) --------
         elif self.state == "defeated":
-            self.frame += 0.05
-            max_frame = len(self.animations["defeated"]) - 1
-            image = self.animations["defeated"][min(int(self.frame), max_frame)]
+            self.frame += 5 # 0.05 frames per tick
+            max_frame = ANIMATION_FRAMES["defeated"] - 1
 
             # Step back slowly only during early defeated frames
-            if int(self.frame) < max_frame:
+            if self.frame // FRAME_SCALE < max_frame:
                 if self.facing_right:
                     if self.x -2 >= self.L_limit: 
                         self.x -= 2  # Move back left if facing right
@@ -202,36 +202,36 @@ class Enemy:
         
         # -------- Animated States (run, jump, throw, etc.) --------
         else:
-            self.frame += 0.09 if self.state == "throw" else 0.13
-            
-            frames = self.animations[self.state]
-            image = frames[int(self.frame) % len(frames)]
-        
-        # Flip character image if facing left
-        if not self.facing_right:
-            image = pygame.transform.flip(image, True, False)
-
-        return image
+            self.frame += 9 if self.state == "throw" else 13 # 0.09 / 0.13 frames per tick
     
-    def draw(self, surface):
-        """Draw the character with current animation frame."""
-        image = self.update_animation()
-        
-        surface.blit(image, (self.x, self.y)) # Draw character
-        
-        # Update hitbox for collision
+    def update_hitbox(self):
+        """Move the collision hitbox to the current position."""
         self.rect = pygame.Rect(self.x+10, self.y+5,80,85)
     
-    def update_shurikens(self, surface):
-        """Update and draw all active shurikens."""
-        for shuriken in self.shurikens[:]:
-            shuriken.update() # Move shuriken
-            shuriken.draw(surface)  # Draw it on the screen
-        
-            # Remove shurikens that went off-screen
-            if not shuriken.active:
-                self.shurikens.remove(shuriken)
+    def get_image(self):
+        """Return the correct animation frame based on the current state and facing."""
+        frames = self.sprites[self.facing_right][self.state]
+
+        # Defeated animation holds on its last frame, the others loop
+        if self.state == "defeated":
+            return frames[min(self.frame // FRAME_SCALE, len(frames) - 1)]
+        return frames[self.frame // FRAME_SCALE % len(frames)]
+    
+    def draw(self, surface, alpha=1.0):
+        """Draw the character with current animation frame and return the area it covered.
+        alpha places it between its previous (0) and current (1) tick position."""
+        x = round(self.prev_x + (self.x - self.prev_x) * alpha)
+        y = round(self.prev_y + (self.y - self.prev_y) * alpha)
+        return surface.blit(self.get_image(), (x, y)) # Draw character
+    
+    def update_shurikens(self):
+        """Move all active shurikens and drop the ones that left the screen."""
+        self.shurikens.update()
+    
+    def draw_shurikens(self, surface, alpha=1.0):
+        """Draw all active shurikens and return the areas they covered."""
+        return [shuriken.draw(surface, alpha) for shuriken in self.shurikens]
     
     def display_health(self,surface):
-        """Display the character's health bar on screen."""
-        self.health_bar.enemy_bar(surface)
+        """Display the character's health bar on screen and return its area."""
+        return self.health_bar.enemy_bar(surface)
@@ -0,0 +1,355 @@
+import argparse
+import multiprocessing
+import os
+import random
+import time
+from multiprocessing import shared_memory
+import numpy as np
+
+import simulation
+from simulation import LEFT, RIGHT, UP, DOWN, SPACE, SHIFT
+from batch import BatchMatch, STATES
+
+# ----------------- Actions -----------------
+# Discrete actions of Naruto, each one input bitmask of Character.handle_input
+ACTIONS = (0, LEFT, RIGHT, UP, DOWN, SPACE, SPACE | SHIFT, LEFT | UP, RIGHT | UP)
+ACTION_NAMES = ("idle", "left", "right", "jump", "block", "throw", "big_throw", "jump_left", "jump_right")
+
+# ----------------- Observations -----------------
+NEAREST_SHURIKENS = 3 # Sasuke's shurikens closest to Naruto included in an observation
+SCREEN_WIDTH = 1000 # Scales for the observation values
+SCREEN_HEIGHT = 600
+JUMP_SPEED = 15
+THROW_TIME = 30 # Longest throw timer (Sasuke's throw)
+START_HEALTH = 200
+BLOCK_LIMIT = 2 # Consecutive blocks Naruto can make
+
+FIGHTER_VALUES = ("x", "y", "vel_y", "facing", "on_ground", "is_hit", "throw_timer", "health") + tuple(
+    f"state_{state}" for state in STATES)
+SHURIKEN_VALUES = ("dx", "dy", "direction", "big", "present")
+
+# Name of every value of an observation vector, in order
+OBSERVATION = (
+    tuple(f"naruto_{value}" for value in FIGHTER_VALUES)
+    + tuple(f"sasuke_{value}" for value in FIGHTER_VALUES)
+    + ("naruto_block_count", "sasuke_is_throwing", "distance", "naruto_shurikens", "sasuke_shurikens")
+    + tuple(f"shuriken{index}_{value}" for index in range(NEAREST_SHURIKENS) for value in SHURIKEN_VALUES)
+)
+OBSERVATION_SIZE = len(OBSERVATION)
+
+# ----------------- Episodes -----------------
+MAX_TICKS = 60 * 60 * 5 # Episodes still running after 5 minutes of game time are truncated
+WIN_REWARD = 1.0 # Added on a win, taken on a loss
+
+def observe(match):
+    """Observation vector (float32, OBSERVATION layout) of a simulation.Match, seen from Naruto."""
+    naruto, sasuke = match.naruto, match.sasuke
+    values = []
+    for fighter in (naruto, sasuke):
+        values += [
+            fighter.x / SCREEN_WIDTH, fighter.y / SCREEN_HEIGHT, fighter.vel_y / JUMP_SPEED,
+            1.0 if fighter.facing_right else -1.0, fighter.on_ground, fighter.is_hit,
+            fighter.throw_timer / THROW_TIME, fighter.health_bar.health / START_HEALTH,
+        ]
+        values += [fighter.state == state for state in STATES]
+
+    values += [
+        naruto.block_count / BLOCK_LIMIT, sasuke.is_throwing, (sasuke.x - naruto.x) / SCREEN_WIDTH,
+        len(naruto.shurikens) / naruto.max_shurikens, len(sasuke.shurikens) / sasuke.max_shurikens,
+    ]
+
+    # Incoming shurikens, closest first (pool order between equals)
+    incoming = sorted(sasuke.shurikens, key=lambda shuriken: abs(shuriken.x - naruto.x))[:NEAREST_SHURIKENS]
+    for shuriken in incoming:
+        values += [(shuriken.x - naruto.x) / SCREEN_WIDTH, (shuriken.y - naruto.y) / SCREEN_HEIGHT,
+                   1.0 if shuriken.speed > 0 else -1.0, shuriken.damage != 10, 1.0]
+    values += [0.0] * len(SHURIKEN_VALUES) * (NEAREST_SHURIKENS - len(incoming))
+    return np.array(values, np.float32)
+
+def observe_batch(batch):
+    """Observations of every match of a BatchMatch, shape (matches, OBSERVATION_SIZE);
+    row i equals observe() of the same match in the object model."""
+    naruto, sasuke = batch.naruto, batch.sasuke
+    columns = np.zeros((OBSERVATION_SIZE, batch.matches)) # One row per value, transposed at the end
+    row = 0
+    for fighter in (naruto, sasuke):
+        columns[row] = fighter.x / SCREEN_WIDTH
+        columns[row + 1] = fighter.y / SCREEN_HEIGHT
+        columns[row + 2] = fighter.vel_y / JUMP_SPEED
+        columns[row + 3] = np.where(fighter.facing_right, 1.0, -1.0)
+        columns[row + 4] = fighter.on_ground
+        columns[row + 5] = fighter.is_hit
+        columns[row + 6] = fighter.throw_timer / THROW_TIME
+        columns[row + 7] = fighter.health / START_HEALTH
+        columns[row + 8:row + 8 + len(STATES)] = fighter.state == np.arange(len(STATES))[:, None]
+        row += len(FIGHTER_VALUES)
+
+    columns[row] = naruto.block_count / BLOCK_LIMIT
+    columns[row + 1] = sasuke.is_throwing
+    columns[row + 2] = (sasuke.x - naruto.x) / SCREEN_WIDTH
+    columns[row + 3] = naruto.count / naruto.max_shurikens
+    columns[row + 4] = sasuke.count / sasuke.max_shurikens
+    row += 5
+
+    # Incoming shurikens: sort the slots by distance, dead slots last
+    live = batch.live_slots(sasuke)
+    dx = sasuke.s_x - naruto.x
+    nearest = np.argsort(np.where(live, np.abs(dx), np.iinfo(dx.dtype).max), axis=0, kind="stable")
+    for slot in nearest[:NEAREST_SHURIKENS]:
+        present = np.take_along_axis(live, slot[None], 0)[0]
+        pick = lambda values: np.take_along_axis(values, slot[None], 0)[0]
+        columns[row] = np.where(present, pick(dx) / SCREEN_WIDTH, 0.0)
+        columns[row + 1] = np.where(present, (pick(sasuke.s_y) - naruto.y) / SCREEN_HEIGHT, 0.0)
+        columns[row + 2] = np.where(present, np.where(pick(sasuke.s_speed) > 0, 1.0, -1.0), 0.0)
+        columns[row + 3] = present & (pick(sasuke.s_big) != 0)
+        columns[row + 4] = present
+        row += len(SHURIKEN_VALUES)
+
+    return columns.T.astype(np.float32)
+
+def outcome_reward(winner):
+    # WIN_REWARD for Naruto winning, minus it for Sasuke winning
+    return WIN_REWARD if winner == "naruto" else -WIN_REWARD if winner == "sasuke" else 0.0
+
+
+class ShinobiEnv:
+    """Naruto vs the enemy.Enemy AI as a reset/step environment (Gymnasium conventions).
+
+    reset() returns (observation, info) and step(action) returns
+    (observation, reward, terminated, truncated, info). Actions index ACTIONS,
+    observations are float32 vectors laid out as OBSERVATION. The reward is
+    the health Naruto took from Sasuke minus the health he lost, as a
+    fraction of the starting health, plus WIN_REWARD on a win (minus on a
+    loss). Episodes are truncated after max_ticks.
+
+    Runs on simulation.Match; see VectorEnv for many environments at once.
+    """
+
+    action_count = len(ACTIONS)
+    observation_size = OBSERVATION_SIZE
+
+    def __init__(self, seed=None, max_ticks=MAX_TICKS):
+        self.seeds = random.Random(seed) # Seeds of the successive episodes
+        self.max_ticks = max_ticks
+        self.match = None
+
+    def reset(self, seed=None):
+        """Start a new episode (seeded from seed, else from the environment's seed sequence)."""
+        if seed is not None:
+            self.seeds.seed(seed)
+        self.match = simulation.Match(headless=True, seed=self.seeds.getrandbits(32))
+        return observe(self.match), {}
+
+    def step(self, action):
+        match = self.match
+        naruto, sasuke = match.naruto.health_bar, match.sasuke.health_bar
+        dealt, taken = sasuke.health, naruto.health
+
+        match.step(ACTIONS[action])
+
+        reward = ((dealt - sasuke.health) - (taken - naruto.health)) / START_HEALTH
+        terminated = match.is_over
+        if terminated:
+            reward += outcome_reward(match.winner)
+        truncated = not terminated and match.tick >= self.max_ticks
+        return observe(match), reward, terminated, truncated, {"winner": match.winner}
+
+
+class VectorEnv:
+    """num_envs ShinobiEnv episodes stepped together on a batch.BatchMatch.
+
+    step(actions) takes an array of ACTIONS indices and returns arrays:
+    observations (num_envs, OBSERVATION_SIZE), rewards, terminated and
+    truncated. Finished environments are reset right away; the observation
+    they ended on is in info["final_observation"], for the rows flagged in
+    info["_final_observation"].
+    """
+
+    action_count = len(ACTIONS)
+    observation_size = OBSERVATION_SIZE
+
+    def __init__(self, num_envs, seed=None, max_ticks=MAX_TICKS):
+        self.num_envs = num_envs
+        self.max_ticks = max_ticks
+        self.batch = BatchMatch(num_envs, seed)
+        self.masks = np.array(ACTIONS)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.batch.rng = np.random.default_rng(seed)
+        self.batch.reset()
+        return observe_batch(self.batch), {}
+
+    def step(self, actions):
+        batch = self.batch
+        dealt, taken = batch.sasuke.health.astype(np.int32), batch.naruto.health.astype(np.int32)
+
+        batch.step(self.masks[actions])
+
+        rewards = ((dealt - batch.sasuke.health) - (taken - batch.naruto.health)) / START_HEALTH
+        terminated = batch.is_over
+        rewards += WIN_REWARD * ((batch.winner == 1).astype(float) - (batch.winner == 2))
+        truncated = ~terminated & (batch.ticks >= self.max_ticks)
+        observations = observe_batch(batch)
+
+        info = {}
+        done = terminated | truncated
+        if done.any():
+            info = {"final_observation": observations.copy(), "_final_observation": done}
+            batch.reset(done)
+            observations[done] = observe_batch(batch)[done]
+        return observations, rewards.astype(np.float32), terminated, truncated, info
+
+# ----------------- Worker Processes -----------------
+def _shared_layout(num_envs):
+    # (name, shape, dtype) of the arrays a SubprocVectorEnv shares with its workers
+    return (
+        ("observations", (num_envs, OBSERVATION_SIZE), np.float32),
+        ("final_observations", (num_envs, OBSERVATION_SIZE), np.float32),
+        ("rewards", (num_envs,), np.float32),
+        ("actions", (num_envs,), np.int64),
+        ("terminated", (num_envs,), bool),
+        ("truncated", (num_envs,), bool),
+        ("final", (num_envs,), bool),
+    )
+
+def _aligned_size(shape, dtype):
+    # Bytes of an array rounded up to 8, so every array of the block stays aligned
+    return -(-int(np.prod(shape)) * np.dtype(dtype).itemsize // 8) * 8
+
+def _shared_arrays(buffer, num_envs):
+    # Views of the shared arrays, packed one after the other in buffer
+    arrays, offset = {}, 0
+    for name, shape, dtype in _shared_layout(num_envs):
+        arrays[name] = np.ndarray(shape, dtype, buffer, offset)
+        offset += _aligned_size(shape, dtype)
+    return arrays
+
+def _worker(connection, memory_name, num_envs, start, stop, seed, max_ticks):
+    # Runs environments start..stop of a SubprocVectorEnv, reading actions from and
+    # writing results to the shared buffer; the pipe only carries commands
+    memory = shared_memory.SharedMemory(memory_name)
+    shared = {name: array[start:stop] for name, array in _shared_arrays(memory.buf, num_envs).items()}
+    env = VectorEnv(stop - start, seed, max_ticks)
+    connection.send("ready")
+
+    while True:
+        command, argument = connection.recv()
+        if command == "step":
+            observations, rewards, terminated, truncated, info = env.step(shared["actions"])
+            shared["rewards"][:] = rewards
+            shared["terminated"][:] = terminated
+            shared["truncated"][:] = truncated
+            shared["final"][:] = info.get("_final_observation", False)
+            if info:
+                shared["final_observations"][:] = info["final_observation"]
+        elif command == "reset":
+            observations, _ = env.reset(argument)
+        else:
+            break
+        shared["observations"][:] = observations
+        connection.send(None)
+
+    del shared
+    memory.close()
+
+
+class SubprocVectorEnv:
+    """VectorEnv split across worker processes (one BatchMatch each).
+
+    Actions, observations, rewards and done flags live in one shared memory
+    block: a step writes the actions, sends each worker a short command and
+    waits for them to finish, without pickling any array. Returns the same
+    values as VectorEnv.step (copies, safe to keep). Call close() when done.
+    """
+
+    action_count = len(ACTIONS)
+    observation_size = OBSERVATION_SIZE
+
+    def __init__(self, num_envs, workers=None, seed=None, max_ticks=MAX_TICKS):
+        self.num_envs = num_envs
+        workers = max(1, min(num_envs, workers or os.cpu_count() or 1))
+        size = sum(_aligned_size(shape, dtype) for _, shape, dtype in _shared_layout(num_envs))
+        self.memory = shared_memory.SharedMemory(create=True, size=size)
+        self.shared = _shared_arrays(self.memory.buf, num_envs)
+
+        # Independent random streams for the workers, derived from seed
+        self.seeds = np.random.SeedSequence(seed)
+        bounds = np.linspace(0, num_envs, workers + 1).astype(int)
+        self.connections, self.processes = [], []
+        for start, stop, worker_seed in zip(bounds, bounds[1:], self.seeds.spawn(workers)):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_worker, args=(child, self.memory.name, num_envs, start, stop, worker_seed, max_ticks), daemon=True)
+            process.start()
+            self.connections.append(parent)
+            self.processes.append(process)
+        for connection in self.connections:
+            connection.recv() # "ready"
+
+    def _run(self, commands):
+        for connection, command in zip(self.connections, commands):
+            connection.send(command)
+        for connection in self.connections:
+            connection.recv()
+
+    def reset(self, seed=None):
+        seeds = np.random.SeedSequence(seed).spawn(len(self.connections)) if seed is not None else [None] * len(self.connections)
+        self._run([("reset", worker_seed) for worker_seed in seeds])
+        return self.shared["observations"].copy(), {}
+
+    def step(self, actions):
+        self.shared["actions"][:] = actions
+        self._run([("step", None)] * len(self.connections))
+
+        shared = self.shared
+        info = {}
+        if shared["final"].any():
+            info = {"final_observation": shared["final_observations"].copy(), "_final_observation": shared["final"].copy()}
+        return (shared["observations"].copy(), shared["rewards"].copy(), shared["terminated"].copy(),
+                shared["truncated"].copy(), info)
+
+    def close(self):
+        """Stop the workers and free the shared memory."""
+        for connection in self.connections:
+            connection.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.shared = None
+        self.memory.close()
+        self.memory.unlink()
+
+# ----------------- Throughput -----------------
+def measure(env, steps, seed=0):
+    """Environment steps per second of env under uniformly random actions."""
+    rng = np.random.default_rng(seed)
+    num_envs = getattr(env, "num_envs", None)
+    env.reset()
+    start = time.perf_counter()
+    for _ in range(steps):
+        if num_envs is None:
+            _, _, terminated, truncated, _ = env.step(int(rng.integers(len(ACTIONS))))
+            if terminated or truncated:
+                env.reset()
+        else:
+            env.step(rng.integers(len(ACTIONS), size=num_envs))
+    return steps * (num_envs or 1) / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure environment steps per second under random actions.")
+    parser.add_argument("-n", "--envs", type=int, default=4096, help="environments of the vectorized runs")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("-t", "--steps", type=int, default=200, help="vectorized steps per run")
+    args = parser.parse_args()
+
+    print(f"single     {measure(ShinobiEnv(seed=0), args.steps * 50):>12,.0f} steps/s")
+    print(f"vector     {measure(VectorEnv(args.envs, seed=0), args.steps):>12,.0f} steps/s ({args.envs} envs)")
+    env = SubprocVectorEnv(args.envs, args.workers, seed=0)
+    try:
+        print(f"subprocess {measure(env, args.steps):>12,.0f} steps/s ({args.envs} envs, {len(env.processes)} workers)")
+    finally:
+        env.close()
+
+# -------------------- Measure Environments --------------------
+if __name__ == "__main__":
+    main()
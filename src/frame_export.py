@@ -0,0 +1,207 @@
+import os
+import time
+import struct
+import atexit
+import argparse
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+import pygame
+
+# ----------------- Export Settings -----------------
+EXPORT_ENV = "SHINOBI_EXPORT" # Shared memory name to export battle frames to (unset: no export)
+SCALE_ENV = "SHINOBI_EXPORT_SCALE" # Optional downscale factor of the exported frames (e.g. 0.5)
+SLOTS = 4 # Frames kept in the ring
+
+# ----------------- Buffer Layout -----------------
+# Header: magic, width, height, slots, bytes per slot, number of the newest complete frame (0: none yet)
+MAGIC = b"SSF1"
+HEADER = struct.Struct("<4sIIIIQ")
+LATEST = struct.Struct("<Q")
+LATEST_OFFSET = HEADER.size - LATEST.size
+HEADER_SIZE = 64
+# Slot header, followed by height * width * 3 bytes of RGB pixels (row by row):
+# sequence (2 * frame number once complete, odd while being written), monotonic_ns of the frame
+SLOT_HEADER = struct.Struct("<QQ")
+SLOT_HEADER_SIZE = 64
+
+_exporter = None # Shared by every battle of the process, created on first use
+
+def get_exporter(size):
+    """Return the process-wide FrameExporter if SHINOBI_EXPORT is set, otherwise None.
+
+    size is the (width, height) of the frames handed to export(); they are
+    exported scaled by SHINOBI_EXPORT_SCALE (default 1). The block is
+    unlinked when the process exits.
+    """
+    global _exporter
+    name = os.environ.get(EXPORT_ENV)
+    if not name:
+        return None
+    if _exporter is None:
+        _exporter = FrameExporter(name, size, float(os.environ.get(SCALE_ENV) or 1))
+        atexit.register(_exporter.close)
+    return _exporter
+
+
+class FrameExporter:
+    """Writes rendered frames into a shared memory ring of SLOTS RGB frames.
+
+    Frame n goes to slot n % slots. Its sequence number is made odd before
+    the pixels are written and set to 2 * n after, then the header's newest
+    frame becomes n: a reader that sees the same even sequence before and
+    after copying a slot got a whole frame (seqlock), and gaps between the
+    frame numbers it reads are frames it missed.
+
+    Every slot is wrapped in a pygame surface over the shared memory, so
+    export() is one SDL blit (plus one scale when downscaling) and no
+    Python-level copy of the pixels.
+    """
+
+    def __init__(self, name, size, scale=1.0, slots=SLOTS):
+        self.size = size
+        self.frame_size = (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+        width, height = self.frame_size
+        self.slots = slots
+        self.slot_size = SLOT_HEADER_SIZE + width * height * 3
+
+        try:
+            self.memory = shared_memory.SharedMemory(name, create=True, size=HEADER_SIZE + slots * self.slot_size)
+        except FileExistsError:
+            # Left behind by a run that did not exit cleanly: replace it
+            stale = shared_memory.SharedMemory(name)
+            stale.close()
+            stale.unlink()
+            self.memory = shared_memory.SharedMemory(name, create=True, size=HEADER_SIZE + slots * self.slot_size)
+        self.buffer = self.memory.buf
+        HEADER.pack_into(self.buffer, 0, MAGIC, width, height, slots, self.slot_size, 0)
+
+        self.targets = [] # One RGB surface over the pixels of each slot
+        for slot in range(slots):
+            start = HEADER_SIZE + slot * self.slot_size + SLOT_HEADER_SIZE
+            self.targets.append(pygame.image.frombuffer(self.buffer[start:start + width * height * 3], self.frame_size, "RGB"))
+        self.scaled = None # Scratch surface in the source format, when downscaling
+        self.frame = 0 # Number of the last exported frame
+
+    def export(self, surface):
+        """Copy surface (the composed frame) into the next slot of the ring."""
+        self.frame += 1
+        slot = self.frame % self.slots
+        offset = HEADER_SIZE + slot * self.slot_size
+        target = self.targets[slot]
+
+        SLOT_HEADER.pack_into(self.buffer, offset, 2 * self.frame - 1, 0) # Being written
+        if self.frame_size == surface.get_size():
+            target.blit(surface, (0, 0))
+        else:
+            # transform.scale only writes to a surface of the source's format
+            if self.scaled is None:
+                self.scaled = pygame.Surface(self.frame_size, 0, surface)
+            pygame.transform.scale(surface, self.frame_size, self.scaled)
+            target.blit(self.scaled, (0, 0))
+        SLOT_HEADER.pack_into(self.buffer, offset, 2 * self.frame, time.monotonic_ns())
+        LATEST.pack_into(self.buffer, LATEST_OFFSET, self.frame)
+
+    def close(self):
+        """Release and unlink the shared memory (readers keep their own mapping)."""
+        if self.memory is None:
+            return
+        self.targets = self.scaled = self.buffer = None # Surfaces hold views of the memory
+        self.memory.close()
+        self.memory.unlink()
+        self.memory = None
+
+# ----------------- Reading -----------------
+def attach(name):
+    # Open an existing block without letting this process's resource tracker
+    # unlink it on exit (it belongs to the exporting process)
+    try:
+        return shared_memory.SharedMemory(name, track=False) # Python 3.13+
+    except TypeError:
+        memory = shared_memory.SharedMemory(name)
+        resource_tracker.unregister(memory._name, "shared_memory")
+        return memory
+
+
+class FrameReader:
+    """Reads the frames a FrameExporter writes, from any process.
+
+    read() returns the oldest frame not read yet that is still in the ring
+    (or the newest one with newest=True); dropped counts the frames skipped.
+    """
+
+    def __init__(self, name):
+        self.memory = attach(name)
+        magic, width, height, self.slots, self.slot_size, _ = HEADER.unpack_from(self.memory.buf)
+        if magic != MAGIC:
+            raise ValueError(f"{name} is not a frame export buffer")
+        self.frame_size = (width, height)
+        self.pixels = [
+            np.ndarray((height, width, 3), np.uint8, self.memory.buf, HEADER_SIZE + slot * self.slot_size + SLOT_HEADER_SIZE)
+            for slot in range(self.slots)
+        ]
+        self.last = 0 # Number of the last frame read
+        self.dropped = 0
+
+    def latest(self):
+        """Number of the newest complete frame (0 before the first one)."""
+        return LATEST.unpack_from(self.memory.buf, LATEST_OFFSET)[0]
+
+    def read(self, out=None, newest=False):
+        """Copy the next frame into out (a (height, width, 3) uint8 array, allocated if None).
+
+        Returns (frame number, monotonic_ns timestamp, pixels), or None when no
+        new frame is available.
+        """
+        if out is None:
+            out = np.empty_like(self.pixels[0])
+        while True:
+            latest = self.latest()
+            if latest <= self.last:
+                return None
+            # The slot after the newest one may already be getting overwritten
+            frame = latest if newest else max(self.last + 1, latest - self.slots + 2)
+            slot = frame % self.slots
+            offset = HEADER_SIZE + slot * self.slot_size
+
+            sequence, _ = SLOT_HEADER.unpack_from(self.memory.buf, offset)
+            if sequence != 2 * frame:
+                continue # Overwritten meanwhile: start again from the new newest frame
+            np.copyto(out, self.pixels[slot])
+            sequence, timestamp = SLOT_HEADER.unpack_from(self.memory.buf, offset)
+            if sequence != 2 * frame:
+                continue # Torn copy
+
+            self.dropped += frame - self.last - 1 if self.last else 0
+            self.last = frame
+            return frame, timestamp, out
+
+    def close(self):
+        self.pixels = None
+        self.memory.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Read exported battle frames and report rate, drops and latency.")
+    parser.add_argument("name", nargs="?", default=None, help=f"shared memory name (default: ${EXPORT_ENV})")
+    parser.add_argument("-s", "--seconds", type=float, default=10, help="how long to read")
+    args = parser.parse_args()
+
+    reader = FrameReader(args.name or os.environ[EXPORT_ENV])
+    out = np.empty_like(reader.pixels[0])
+    frames, latency = 0, 0
+    end = time.monotonic() + args.seconds
+    while time.monotonic() < end:
+        result = reader.read(out)
+        if result is None:
+            time.sleep(0.001)
+            continue
+        frames += 1
+        latency += time.monotonic_ns() - result[1]
+    reader.close()
+
+    width, height = reader.frame_size
+    print(f"{width}x{height}: {frames / args.seconds:.1f} frames/s, {reader.dropped} dropped, "
+          f"{latency / max(frames, 1) / 1e6:.2f} ms average latency")
+
+# -------------------- Read Exported Frames --------------------
+if __name__ == "__main__":
+    main()
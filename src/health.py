@@ -10,26 +10,44 @@ class HealthBar:
         self.hitbox=(self.x +10 ,self.y +5 ,80,80) # Rect area around icon (can be used for collisions or UI)
         self.health=200 # Initial health value
         self.damage = 0 # Amount of damage taken (used to offset enemy health bar position)
+
+        # Pre-composited HUD layer (icon + bars), rebuilt only when health changes
+        self.layer = None
+        self.layer_rect = None
+        self.layer_key = None
     
     def player_bar(self,surface):
-        # Draw the player's health bar and icon on the screen
-        surface.blit(self.icon, (10, 10))  # Draw the player's icon at the top-left
-        
-        # Draw the red background (full bar)
-        pygame.draw.rect(surface, (255, 0, 0), (87, 38, 202, 25))
-
-        # Draw the green bar (remaining health)
-        pygame.draw.rect(surface, (0, 255, 0), (89, 43, self.health, 15))
+        # Draw the player's health bar and icon on the screen:
+        # icon at the top-left, red background (full bar), green bar (remaining health)
+        return self.draw_layer(surface, (10, 10), (87, 38, 202, 25), (89, 43, self.health, 15))
     
     def enemy_bar(self,surface):
-        # Draw the enemy's health bar and icon on the screen
-        surface.blit(self.icon, (910, 10))  # Draw enemy icon at the top-right
+        # Draw the enemy's health bar and icon on the screen:
+        # icon at the top-right, red background (full bar), green bar that shrinks from right to left
+        return self.draw_layer(surface, (910, 10), (710, 38, 202, 25), (710 + self.damage, 43, self.health, 15))
+
+    def draw_layer(self, surface, icon_pos, back_rect, health_rect):
+        """Blit the cached HUD layer, re-compositing it first if health changed.
+        Returns the screen area covered by the layer."""
+        key = (self.health, self.damage)
+        if key != self.layer_key:
+            self.compose_layer(icon_pos, pygame.Rect(back_rect), pygame.Rect(health_rect))
+            self.layer_key = key
+
+        return surface.blit(self.layer, self.layer_rect)
+
+    def compose_layer(self, icon_pos, back_rect, health_rect):
+        # Layer covers the icon and the bar; everything is drawn relative to its corner
+        self.layer_rect = self.icon.get_rect(topleft=icon_pos).union(back_rect)
+        self.layer = pygame.Surface(self.layer_rect.size, pygame.SRCALPHA)
+        offset_x, offset_y = -self.layer_rect.x, -self.layer_rect.y
 
-        # Draw the red background (full bar)
-        pygame.draw.rect(surface, (255, 0, 0), (710, 38, 202, 25))
+        # Copy the icon pixels as-is (including alpha) so the layer blends exactly like the icon
+        self.layer.blit(self.icon, (icon_pos[0] + offset_x, icon_pos[1] + offset_y), special_flags=pygame.BLEND_RGBA_MAX)
 
-        # Draw the green bar (remaining health) that shrinks from right to left
-        pygame.draw.rect(surface, (0, 255, 0), (710 + self.damage, 43, self.health, 15))
+        # Red background (full bar) and green bar (remaining health)
+        pygame.draw.rect(self.layer, (255, 0, 0), back_rect.move(offset_x, offset_y))
+        pygame.draw.rect(self.layer, (0, 255, 0), health_rect.move(offset_x, offset_y))
 
     def player_hit(self):
         # Reduce player health by 10 (used when player gets hit)
@@ -1,6 +1,8 @@
 import pygame
 import button
-from assets import images, sounds  # Import centralized assets
+import audio
+from text_cache import render_text
+from assets import images, preload_scene  # Import centralized assets
 
 # ----------------- Help Screen Function -----------------
 def help_screen(SCREEN_WIDTH):
@@ -8,9 +10,12 @@ def help_screen(SCREEN_WIDTH):
     clock = pygame.time.Clock()
     FPS = 60
     
-    # --- Font and Sound ---
-    font = pygame.font.SysFont("comicsans", 30, True)
-    click = sounds["click"]
+    preload_scene("help") # Load this screen's images and sounds up front
+    
+    # --- Font, Screen and Sound ---
+    font_name, font_size = "comicsans", 30 # Bold system font used for every line
+    screen = pygame.display.get_surface()
+    audio_manager = audio.get_audio()
 
     # --- Load Button Images ---
     back_img = images["back"]
@@ -33,20 +38,20 @@ def help_screen(SCREEN_WIDTH):
     # ----------------- Help Screen Loop -----------------
     while help_running:
         clock.tick(FPS)  # Maintain frame rate
-        pygame.display.get_surface().fill("black")  # Clear screen
+        screen.fill("black")  # Clear screen
 
-        # --- Render Title ---
-        title_text = font.render("Controls", True, "red")
-        pygame.display.get_surface().blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 30))
+        # --- Render Title (rasterised once, then served from the text cache) ---
+        title_text = render_text("Controls", font_name, font_size, "red", bold=True)
+        screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 30))
 
         # --- Render Instructions ---
         for i, line in enumerate(instructions):
-            rendered_line = font.render(line, True, "white")
-            pygame.display.get_surface().blit(rendered_line, (20, 80 + i * 60))
+            rendered_line = render_text(line, font_name, font_size, "white", bold=True)
+            screen.blit(rendered_line, (20, 80 + i * 60))
 
         # --- Draw Back Button ---
-        if back_button.draw(pygame.display.get_surface()):
-            click.play()
+        if back_button.draw(screen):
+            audio_manager.play("click")
             help_running = False  # Exit Help Screen
 
         # --- Event Handling ---
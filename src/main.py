@@ -1,6 +1,8 @@
 import pygame 
+import audio
 
 # -------------------- Initialize Pygame --------------------
+audio.pre_init() # Low-latency mixer settings, must come before pygame.init()
 pygame.init()
 
 # -------------------- Global Settings --------------------
@@ -14,7 +16,9 @@ pygame.display.set_caption("Shinobi Saga")
 import button
 import battle
 import help
-from assets import images, sounds  # Import preloaded images and sounds
+from assets import images, play_music, preload_scene, preload_scene_async, warm_cache  # Lazily loaded images and sounds
+
+preload_scene("menu") # Only the menu is needed before the first frame
 
 # -------------------- Setup Buttons --------------------
 start_button = button.Button(375, 460, images["start"], 1)
@@ -28,6 +32,7 @@ def main():
     
     # Flag to control the main loop
     running = True
+    first_frame = True # Music and battle preloading start once the menu is on screen
 
     while running:
         
@@ -41,18 +46,18 @@ def main():
         
         # Start Game Button
         if start_button.draw(screen):
-            sounds["click"].play() # Play click sound
+            audio.get_audio().play("click") # Play click sound
             battle_screen = battle.Battle() # Create battle instance
             battle_screen.run_game()  # Run the battle screen
 
         # Help Button
         if help_button.draw(screen):
-            sounds["click"].play() # Play click sound
+            audio.get_audio().play("click") # Play click sound
             help.help_screen(SCREEN_WIDTH)  # Show help screen
 
         # Exit Button
         if exit_button.draw(screen):
-            sounds["click"].play() # Play click sound
+            audio.get_audio().play("click") # Play click sound
             running = False # Exit the main menu loop
 
         # ---- Handle Quit Event ----
@@ -61,6 +66,12 @@ def main():
                 running = False # Quit the game if user closes the window
 
         pygame.display.flip()  # Update the full display surface to the screen
+        
+        if first_frame:
+            play_music()
+            preload_scene_async("battle") # Battle sprites load while the user is on the menu
+            warm_cache() # Decode the rest (help screen, ...) into the surface cache meanwhile
+            first_frame = False
 
     # ---- Clean Exit ----
     pygame.quit() # Close the Pygame window and clean up resources
@@ -1,18 +1,34 @@
 import pygame 
-from shuriken import Shuriken # Import Shuriken class for projectile attacks
+from shuriken import ShurikenPool, SPEED as SHURIKEN_SPEED # Shuriken pool for projectile attacks
 import random
 from health import HealthBar # Import custom HealthBar class for visual health display
-from assets import images, sounds, load_animation , load_character # Centralized asset import
+from assets import get_character_assets, ANIMATION_FRAMES, FRAME_SCALE # Centralized asset import
 
 class Character:
     
-    def __init__(self, x, y):
-        """Initialize the character with position, motion, animations, health, etc."""
+    # Per-tick state captured by Match.snapshot (everything else is constant or derived)
+    SNAPSHOT_FIELDS = (
+        "x", "y", "vel_y", "is_jumping", "on_ground", "facing_right", "is_big",
+        "is_hit", "state", "frame", "throw_timer", "block_count",
+    )
+    
+    def __init__(self, x, y, headless=False, rng=None):
+        """Initialize the character with position, motion, animations, health, etc.
+        
+        A headless character skips all sprite loading and can only be simulated.
+        rng is the random source for its random choices (defaults to the
+        global random module); pass a seeded random.Random for reproducible matches.
+        """
+        
+        self.name = "naruto" # Character name used in match stats
+        self.rng = rng if rng is not None else random # Source of random choices
         
         # ----- Position & Movement -----
         self.x = x  # X coordinate (horizontal position)
         self.y = y  # Y coordinate (vertical position)
         self.constant_y = y # Base/ground Y position used for resetting jump
+        self.prev_x = x # Position at the start of the last tick (for render interpolation)
+        self.prev_y = y
         self.vel_x = 5  # Speed of horizontal movement
         self.vel_y = 0  # Initial vertical velocity (used for jumping)
         self.gravity = 1  # Gravity effect on jumping
@@ -23,42 +39,29 @@ class Character:
         self.is_jumping = False  # Flag to check if currently jumping
         self.on_ground = True  # Flag to check if on the ground
         self.facing_right = True  # Direction the character is facing
-        self.shurikens = []  # List to store thrown shuriken objects
+        self.shurikens = ShurikenPool()  # Thrown shurikens in flight (reused between throws)
+        self.max_shurikens = 6 # Max shurikens in flight at once
+        self.shuriken_speed = SHURIKEN_SPEED # Pixels per tick of thrown shurikens
         self.is_big=False # Determines if next shuriken is big
         self.is_hit = False # Set to True when hit by a shuriken
 
         # ----- Animation & Logic -----
         self.state = "stand"  # Initial animation state
-        self.frame = 0  # Frame index for animations
-        self.animation_speed = 0.3  # Speed of animation transitions
+        self.frame = 0  # Animation position, in 1/FRAME_SCALE frames
+        self.animation_speed = 30  # Run animation speed (0.3 frames per tick)
         self.throw_timer = 0  # Timer to manage shuriken throw cooldown
         self.block_count = 0 # How many times player has blocked consecutively
+        self.events = [] # Sound events ("throw", "jump") raised this tick
+        self.rect = pygame.Rect(self.x+10, self.y+5,80,85) # Hitbox for collision
 
         # ----- UI & Health -----
-        self.icon = images["naruto_head"] # Load character head icon for health bar
+        # Sprites and head icon come from the shared registry, loaded once per process
+        assets = {} if headless else get_character_assets("naruto")
+        self.icon = assets.get("icon") # Character head icon for health bar
         self.health_bar=HealthBar(self.icon,self.x,self.y) # Create health bar instance
         
-        # ----- Static Images for One-Frame States -----
-        self.images = {
-            "stand": load_character("naruto","stand"),
-            "block": load_character("naruto","guard"),
-            "small_damage": load_character("naruto","small_damage"),
-            "big_damage": load_character("naruto","big_damage"),
-            "winner": load_character("naruto","winner"),
-        }
-
-        # ----- Animated State Sequences -----
-        self.animations = {
-            "run": load_animation("naruto","run", 6),
-            "jump": load_animation("naruto","jump", 4),
-            "throw": load_animation("naruto","throw", 3),
-            "defeated": load_animation("naruto","defeated",3),
-        }
-        
-        # ----- Sound Effects -----
-        self.jump_sound = sounds["jump"]
-        self.throw_sound = sounds["throw"]
-        self.block_sound= sounds["block"]
+        # ----- Sprites for both facing directions -----
+        self.sprites = assets.get("sprites", {})
 
     def handle_input(self, keys):
         """Handle keyboard input to control character movement and actions."""
@@ -78,21 +81,21 @@ class Character:
             # Check for big shuriken with Shift
             self.is_big = True if (keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]) else False 
             
-            self.throw_sound.play()
+            self.events.append("throw")
             self.state = "throw"
             self.frame = 0
-            self.throw_timer = len(self.animations["throw"]) * 4 # Cooldown duration
+            self.throw_timer = ANIMATION_FRAMES["throw"] * 4 # Cooldown duration
             
             # Add shuriken if under max and randomly selected
-            if len(self.shurikens) < 6 and random.randint(1,2) == 1:
+            if len(self.shurikens) < self.max_shurikens and self.rng.randint(1,2) == 1:
                 
-                # Create a new shuriken and add it to the list
-                new_shuriken = Shuriken(
+                # Throw a shuriken from the pool
+                self.shurikens.acquire(
                     self.x + 60 if self.facing_right else self.x + 20, 
                     self.y, 
                     self.facing_right,
-                    self.is_big)
-                self.shurikens.append(new_shuriken)
+                    self.is_big,
+                    self.shuriken_speed)
                 
                 # Reset block chain after attack
                 if self.block_count > 0:
@@ -124,7 +127,7 @@ class Character:
         
         # ---- Jumping ----
         if keys[pygame.K_UP] and self.on_ground :
-            self.jump_sound.play()
+            self.events.append("jump")
             self.is_jumping = True
             self.on_ground = False
             self.vel_y = -15 # Initial jump force
@@ -159,30 +162,26 @@ class Character:
                 self.y += 1
 
     def update_animation(self):
-        """Return the correct animation frame based on the current state."""
+        """Advance the animation frame counter and timed state changes by one tick."""
 
         # -------- Static States (single frame) --------
         if self.state in ["stand", "block","winner"]:
-            image = self.images[self.state]
             self.frame = 0
         
         # ---- Damage Reaction Frames ----
         elif self.state in ["small_damage", "big_damage"]:
-            image = self.images[self.state]
-            self.frame += 1
-            if self.frame > 10:  # Show damage image for ~10 frames
+            self.frame += FRAME_SCALE
+            if self.frame > 10 * FRAME_SCALE:  # Show damage image for ~10 frames
                 self.is_hit = False
                 self.state = "stand"
                 self.frame = 0
         
         # -------- Defeated Animation (multi-frame + step back) --------
         elif self.state == "defeated":
-            self.frame += 0.05 # Slower defeat animation
+            self.frame += 5 # Slower defeat animation (0.05 frames per tick)
 
-            defeated_frames = self.animations["defeated"]
-            max_frame = len(defeated_frames) - 1
-            current_frame_index = min(int(self.frame), max_frame)
-            image = defeated_frames[current_frame_index]
+            max_frame = ANIMATION_FRAMES["defeated"] - 1
+            current_frame_index = min(self.frame // FRAME_SCALE, max_frame)
 
             # Step back effect only during early defeat frames
             if current_frame_index < max_frame:
@@ -195,36 +194,36 @@ class Character:
         
         # -------- Animated States (run, jump, throw, etc.) --------
         else:
-            self.frame += self.animation_speed if self.state == "run" else 0.1
-            
-            frames = self.animations[self.state]
-            image = frames[int(self.frame) % len(frames)]
+            self.frame += self.animation_speed if self.state == "run" else 10
 
-        # -------- Flip Image if Facing Left --------
-        if not self.facing_right:
-            image = pygame.transform.flip(image, True, False)
-
-        return image
-        
-    def draw(self, surface):
-        """Draw the character with current animation frame."""
-        image = self.update_animation()
-        
-        surface.blit(image, (self.x, self.y))  # Draw character
-        
-        # Update hitbox for collision
+    def update_hitbox(self):
+        """Move the collision hitbox to the current position."""
         self.rect = pygame.Rect(self.x+10, self.y+5,80,85)
 
-    def update_shurikens(self, surface):
-        """Update and draw all active shurikens."""
-        for shuriken in self.shurikens[:]:
-            shuriken.update() # Move shuriken
-            shuriken.draw(surface)  # Draw it on the screen
-        
-            # Remove shurikens that went off-screen
-            if not shuriken.active:
-                self.shurikens.remove(shuriken)
+    def get_image(self):
+        """Return the correct animation frame based on the current state and facing."""
+        frames = self.sprites[self.facing_right][self.state]
+
+        # Defeated animation holds on its last frame, the others loop
+        if self.state == "defeated":
+            return frames[min(self.frame // FRAME_SCALE, len(frames) - 1)]
+        return frames[self.frame // FRAME_SCALE % len(frames)]
+    
+    def draw(self, surface, alpha=1.0):
+        """Draw the character with current animation frame and return the area it covered.
+        alpha places it between its previous (0) and current (1) tick position."""
+        x = round(self.prev_x + (self.x - self.prev_x) * alpha)
+        y = round(self.prev_y + (self.y - self.prev_y) * alpha)
+        return surface.blit(self.get_image(), (x, y))  # Draw character
+
+    def update_shurikens(self):
+        """Move all active shurikens and drop the ones that left the screen."""
+        self.shurikens.update()
+
+    def draw_shurikens(self, surface, alpha=1.0):
+        """Draw all active shurikens and return the areas they covered."""
+        return [shuriken.draw(surface, alpha) for shuriken in self.shurikens]
 
     def display_health(self,surface):
-        """Display the character's health bar on screen."""
-        self.health_bar.player_bar(surface)
+        """Display the character's health bar on screen and return its area."""
+        return self.health_bar.player_bar(surface)
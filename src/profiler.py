@@ -0,0 +1,187 @@
+import os
+import csv
+import json
+import time
+import atexit
+from collections import deque
+import pygame
+from text_cache import get_font
+
+# ----------------- Profiler Settings -----------------
+PROFILE_ENV = "SHINOBI_PROFILE" # Set to a .csv or .json path to profile battles and dump on exit
+WINDOW = 600 # Frames kept for the rolling percentiles (~5 s at 120 FPS)
+TOGGLE_KEY = pygame.K_F3 # Shows/hides the on-screen overlay
+OVERLAY_REFRESH = 30 # Frames between overlay text refreshes (keeps it readable and cheap)
+OVERLAY_FONT = ("couriernew", 16)
+
+_profiler = None # Shared by every battle of the process, created on first use
+
+def get_profiler():
+    """Return the process-wide FrameProfiler if SHINOBI_PROFILE is set, otherwise None.
+
+    With the variable unset nothing is instrumented, so profiling costs nothing.
+    """
+    global _profiler
+    path = os.environ.get(PROFILE_ENV)
+    if not path:
+        return None
+    if _profiler is None:
+        _profiler = FrameProfiler(path)
+        atexit.register(_profiler.close)
+    return _profiler
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted, non-empty sequence."""
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class FrameProfiler:
+    """Per-phase frame timings with rolling p50/p95/p99, an overlay and a CSV/JSON dump.
+
+    Phases are timed by replacing an object's method with a timed wrapper
+    (instrument), and end_frame() closes each frame: the time every phase
+    took during it is pushed into a rolling window. Times are inclusive, so
+    a phase called from inside another one (e.g. apply_physics from
+    move_enemy) counts towards both.
+
+    A .csv dump path gets one row per frame (written as the game runs), any
+    other path gets a JSON summary when close() is called.
+    """
+
+    def __init__(self, path=None, window=WINDOW):
+        self.path = path
+        self.window = window
+        self.phases = [] # Phase names, in instrumentation order
+        self.current = {} # Phase -> nanoseconds spent in it this frame
+        self.samples = {} # Phase -> rolling window of per-frame milliseconds
+        self.totals = {} # Phase -> (frames, total ms, max ms) over the whole run
+        self.frames = 0
+        self.last_end = None # perf_counter_ns of the previous end_frame
+
+        self.overlay = False # Overlay visible (toggled with TOGGLE_KEY)
+        self.overlay_lines = [] # Rendered text lines, refreshed every OVERLAY_REFRESH frames
+
+        self.csv_file = None
+        self.csv_writer = None
+        self.add_phase("frame") # Real time between two frames (what the FPS is)
+
+    def add_phase(self, phase):
+        if phase not in self.samples:
+            self.phases.append(phase)
+            self.samples[phase] = deque(maxlen=self.window)
+            self.totals[phase] = (0, 0.0, 0.0)
+
+    def instrument(self, owner, name, phase=None):
+        """Time every call of owner.name (a method) under phase (defaults to name).
+
+        The wrapper is stored on the instance, so only that object is affected.
+        """
+        phase = phase or name
+        self.add_phase(phase)
+        method = getattr(owner, name)
+        current = self.current
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                current[phase] = current.get(phase, 0) + clock() - start
+
+        setattr(owner, name, timed)
+
+    def end_frame(self):
+        """Close the current frame: record how long each phase took during it."""
+        now = time.perf_counter_ns()
+        if self.last_end is not None:
+            self.current["frame"] = now - self.last_end
+        self.last_end = now
+
+        row = []
+        for phase in self.phases:
+            ms = self.current.get(phase, 0) / 1_000_000
+            self.samples[phase].append(ms)
+            count, total, worst = self.totals[phase]
+            self.totals[phase] = (count + 1, total + ms, max(worst, ms))
+            row.append(ms)
+        self.current.clear()
+        self.frames += 1
+
+        if self.path and self.path.endswith(".csv"):
+            self.write_row(row)
+        if self.overlay and self.frames % OVERLAY_REFRESH == 0:
+            self.refresh_overlay()
+
+    def skip_frame(self):
+        """Drop the current frame (e.g. the pause menu): nothing is recorded and
+        the next frame's time starts from here, so the pause does not count."""
+        self.last_end = time.perf_counter_ns()
+        self.current.clear()
+
+    def stats(self, phase):
+        """Return (p50, p95, p99) of a phase over the rolling window, in milliseconds."""
+        ordered = sorted(self.samples[phase])
+        if not ordered:
+            return 0.0, 0.0, 0.0
+        return percentile(ordered, 0.50), percentile(ordered, 0.95), percentile(ordered, 0.99)
+
+    def summary(self):
+        """Return every phase's rolling percentiles and whole-run mean/max (ms) as a dict."""
+        result = {}
+        for phase in self.phases:
+            p50, p95, p99 = self.stats(phase)
+            count, total, worst = self.totals[phase]
+            result[phase] = {
+                "p50": round(p50, 4), "p95": round(p95, 4), "p99": round(p99, 4),
+                "mean": round(total / count, 4) if count else 0.0, "max": round(worst, 4),
+            }
+        return {"frames": self.frames, "window": self.window, "phases": result}
+
+    # ----------------- Export -----------------
+    def write_row(self, row):
+        if self.csv_writer is None:
+            self.csv_file = open(self.path, "w", newline="")
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(["frame_index"] + [phase + "_ms" for phase in self.phases])
+        self.csv_writer.writerow([self.frames] + [f"{ms:.4f}" for ms in row])
+
+    def close(self):
+        """Finish the dump: close the CSV, or write the JSON summary."""
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = self.csv_writer = None
+        elif self.path and not self.path.endswith(".csv"):
+            with open(self.path, "w") as file:
+                json.dump(self.summary(), file, indent=2)
+
+    # ----------------- Overlay -----------------
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        if self.overlay:
+            self.refresh_overlay()
+
+    def refresh_overlay(self):
+        # Numbers change on every refresh, so render with the font directly
+        # instead of filling the shared text cache with one-off strings
+        font = get_font(*OVERLAY_FONT)
+        lines = [f"{'phase':<10}{'p50':>8}{'p95':>8}{'p99':>8} ms"]
+        for phase in self.phases:
+            p50, p95, p99 = self.stats(phase)
+            lines.append(f"{phase:<10}{p50:8.2f}{p95:8.2f}{p99:8.2f}")
+        self.overlay_lines = [font.render(line, True, (255, 255, 255)) for line in lines]
+
+    def draw_overlay(self, surface, pos=(10, 100)):
+        """Draw the overlay if visible and return the areas it covered (empty when hidden)."""
+        if not self.overlay or not self.overlay_lines:
+            return []
+        width = max(line.get_width() for line in self.overlay_lines) + 10
+        height = sum(line.get_height() for line in self.overlay_lines) + 10
+        box = pygame.Rect(pos, (width, height))
+        surface.fill((0, 0, 0), box)
+
+        y = box.y + 5
+        for line in self.overlay_lines:
+            surface.blit(line, (box.x + 5, y))
+            y += line.get_height()
+        return [box]
@@ -0,0 +1,71 @@
+import pygame
+
+class FullRenderer:
+    """Redraws the whole background and flips the full display every frame."""
+
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+
+    def reset(self):
+        """Forget the previous frame (nothing to forget when redrawing everything)."""
+
+    def begin_frame(self):
+        """Clear the screen to the background."""
+        self.screen.blit(self.background, (0, 0))
+
+    def mark(self, rect):
+        """Record a drawn area (unused: the whole screen is pushed)."""
+
+    def mark_all(self, rects):
+        """Record several drawn areas (unused: the whole screen is pushed)."""
+
+    def invalidate(self):
+        """Force a full-screen update (always the case here)."""
+
+    def end_frame(self):
+        """Push the frame to the display."""
+        pygame.display.flip()
+
+
+class DirtyRectRenderer:
+    """Redraws and pushes only the screen areas sprites, HUD and buttons touched.
+
+    Every frame the background is restored under whatever was drawn in the
+    previous frame, the scene is drawn again while each draw call marks the
+    rect it covered, and only the previous and current rects are sent to
+    the display with pygame.display.update(rects) instead of a full flip.
+    """
+
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+        self.screen_rect = screen.get_rect()
+        self.reset()
+
+    def reset(self):
+        """Treat the whole screen as dirty, e.g. when another scene drew on it."""
+        self.dirty = [self.screen_rect.copy()] # Rects drawn in the previous frame
+        self.drawn = [] # Rects drawn in the current frame
+
+    def begin_frame(self):
+        """Restore the background under everything drawn in the previous frame."""
+        for rect in self.dirty:
+            self.screen.blit(self.background, rect, rect)
+
+    def mark(self, rect):
+        """Record an area drawn this frame."""
+        self.drawn.append(rect)
+
+    def mark_all(self, rects):
+        """Record several areas drawn this frame."""
+        self.drawn.extend(rects)
+
+    def invalidate(self):
+        """Push (and next frame restore) the whole screen, for full-screen overlays."""
+        self.drawn.append(self.screen_rect.copy())
+
+    def end_frame(self):
+        """Push the old and new dirty areas to the display."""
+        pygame.display.update(self.dirty + self.drawn)
+        self.dirty, self.drawn = self.drawn, []
@@ -0,0 +1,213 @@
+import os
+import sys
+import time
+import struct
+import argparse
+import multiprocessing
+
+import simulation
+
+# ----------------- Replay Settings -----------------
+REPLAY_ENV = "SHINOBI_REPLAYS" # Folder to save a replay of every battle round to (unset: no recording)
+EXTENSION = ".replay"
+TICK_RATE = 60 # Ticks per second of the recorded game (battle.TICK_RATE)
+
+# ----------------- File Format -----------------
+# Header: magic, version, rule flags, tick rate, match seed, ticks, winner (0 none,
+# 1 naruto, 2 sasuke), Match.state_hash() after the last tick. Then one entry per
+# run of identical ticks: the input bitmask (1 byte) and the run length (varint).
+MAGIC = b"SSR1"
+VERSION = 2 # 2: MatchRandom.randint() draws like random.Random (version 1 replays play another match)
+HEADER = struct.Struct("<4sBBHQIBI")
+CLASHES = 1 # Rule flag: shuriken_clashes
+WINNERS = (None, "naruto", "sasuke")
+
+def replay_dir():
+    """Folder replays are recorded to (SHINOBI_REPLAYS), or None when recording is off."""
+    return os.environ.get(REPLAY_ENV) or None
+
+def write_varint(out, value):
+    # LEB128: 7 bits per byte, high bit set on all but the last
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class Replay:
+    """A battle round stored as its match seed and per-tick input bitmasks.
+
+    The inputs are kept as [mask, ticks] runs, so recording a tick is O(1)
+    and a minute of play takes a few hundred bytes to a few KB. The winner
+    and the state hash at the end (finish()) let playback check that the
+    engine still produces the same match.
+    """
+
+    def __init__(self, seed, runs=None, shuriken_clashes=False, tick_rate=TICK_RATE):
+        self.seed = seed
+        self.runs = runs if runs is not None else [] # [input mask, ticks] pairs
+        self.ticks = sum(ticks for _, ticks in self.runs)
+        self.shuriken_clashes = shuriken_clashes
+        self.tick_rate = tick_rate
+        self.winner = None
+        self.final_hash = None
+
+    def record(self, mask):
+        """Append one tick of input."""
+        runs = self.runs
+        if runs and runs[-1][0] == mask:
+            runs[-1][1] += 1
+        else:
+            runs.append([mask, 1])
+        self.ticks += 1
+
+    def finish(self, match):
+        """Remember how the recorded match ended (checked by verify())."""
+        self.winner = match.winner
+        self.final_hash = match.state_hash()
+
+    def masks(self):
+        """Yield the input mask of every recorded tick, in order."""
+        for mask, ticks in self.runs:
+            for _ in range(ticks):
+                yield mask
+
+    # ----------------- Encoding -----------------
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(
+            MAGIC, VERSION, CLASHES if self.shuriken_clashes else 0, self.tick_rate, self.seed,
+            self.ticks, WINNERS.index(self.winner), self.final_hash or 0))
+        for mask, ticks in self.runs:
+            out.append(mask)
+            write_varint(out, ticks)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, flags, tick_rate, seed, ticks, winner, final_hash = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a Shinobi Saga replay (or from another version)")
+
+        runs, offset = [], HEADER.size
+        while offset < len(data):
+            mask = data[offset]
+            count, offset = read_varint(data, offset + 1)
+            runs.append([mask, count])
+
+        replay = cls(seed, runs, bool(flags & CLASHES), tick_rate)
+        if replay.ticks != ticks:
+            raise ValueError("truncated replay")
+        replay.winner = WINNERS[winner]
+        replay.final_hash = final_hash
+        return replay
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+    def save_to(self, directory):
+        """Save under directory with a timestamped name and return the path."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.seed:08x}{EXTENSION}")
+        self.save(path)
+        return path
+
+# ----------------- Playback -----------------
+def play(replay):
+    """Replay headless as fast as possible and return the final simulation.Match."""
+    match = simulation.Match(headless=True, seed=replay.seed, shuriken_clashes=replay.shuriken_clashes)
+    step = match.step
+    for mask, ticks in replay.runs:
+        for _ in range(ticks):
+            step(mask)
+    return match
+
+def verify(path):
+    """Replay a file headless and compare its end with the recorded one."""
+    replay = Replay.load(path)
+    match = play(replay)
+    return {
+        "path": path,
+        "ticks": replay.ticks,
+        "winner": replay.winner,
+        "replayed_winner": match.winner,
+        "same_state": match.state_hash() == replay.final_hash,
+    }
+
+def verify_all(paths, workers=None):
+    """verify() every file across a process pool; returns the results in order."""
+    workers = max(1, min(len(paths), workers or os.cpu_count() or 1))
+    with multiprocessing.Pool(workers) as pool:
+        return list(pool.imap(verify, paths, max(1, len(paths) // (workers * 4))))
+
+def watch(path):
+    """Show a replay in the battle window at its real speed."""
+    import audio
+    audio.pre_init() # Low-latency mixer settings, must come before pygame.init()
+    import battle # Imported late: opens the game window
+    battle.Battle(replay=Replay.load(path)).run_game()
+
+def collect(paths):
+    # Files given directly, plus every replay inside the folders given
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found += sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(EXTENSION))
+        else:
+            found.append(path)
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch or verify recorded battle replays (run from the repository root).")
+    commands = parser.add_subparsers(dest="command", required=True)
+    verify_command = commands.add_parser("verify", help="replay files headless and check they end the same way")
+    verify_command.add_argument("paths", nargs="+", help="replay files or folders of them")
+    verify_command.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    watch_command = commands.add_parser("watch", help="play a replay in the game window")
+    watch_command.add_argument("path")
+    info_command = commands.add_parser("info", help="print a replay's header")
+    info_command.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "watch":
+        watch(args.path)
+
+    elif args.command == "info":
+        replay = Replay.load(args.path)
+        print(f"seed {replay.seed}, {replay.ticks} ticks ({replay.ticks / replay.tick_rate:.1f}s) in "
+              f"{len(replay.runs)} runs, {os.path.getsize(args.path)} bytes, winner {replay.winner or 'none'}")
+
+    else:
+        paths = collect(args.paths)
+        start = time.perf_counter()
+        results = verify_all(paths, args.workers)
+        elapsed = time.perf_counter() - start
+
+        failed = [result for result in results if not result["same_state"] or result["winner"] != result["replayed_winner"]]
+        for result in failed:
+            print(f"MISMATCH {result['path']}: winner {result['winner']} -> {result['replayed_winner']}"
+                  + ("" if result["same_state"] else ", final state differs"))
+        game_time = sum(result["ticks"] for result in results) / TICK_RATE
+        print(f"{len(results) - len(failed)}/{len(results)} replays verified, "
+              f"{game_time:.0f}s of game time in {elapsed:.2f}s ({game_time / max(elapsed, 1e-9):.0f}x real time)")
+        if failed:
+            sys.exit(1)
+
+# -------------------- Replay Tool --------------------
+if __name__ == "__main__":
+    main()
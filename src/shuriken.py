@@ -1,10 +1,44 @@
 import pygame
 from assets import images # Centralized asset import
 
+SPEED = 10 # Default horizontal speed in pixels per tick
+
+# ----------------- Rotation Cache -----------------
+ROTATION_STEP = 15 # Degrees the shuriken spins every frame
+_rotations = {} # Image name -> pre-rotated frames shared by every shuriken
+
+def get_rotations(img_name):
+    """Return the pre-rotated frames of a shuriken image, building them on first use.
+
+    Each frame is (image, width, height, half_width, half_height) and the list
+    is indexed by angle // ROTATION_STEP.
+    """
+    frames = _rotations.get(img_name)
+    if frames is None:
+        frames = []
+        for angle in range(0, 360, ROTATION_STEP):
+            rotated = pygame.transform.rotate(images[img_name], angle)
+            width, height = rotated.get_size()
+            frames.append((rotated, width, height, width // 2, height // 2))
+        _rotations[img_name] = frames
+    return frames
+
 # Shuriken class to handle its behavior and rendering
 class Shuriken:
     
-    def __init__(self, x, y, facing_right,is_big):
+    # Fixed attribute set: no per-instance dict, and pooled shurikens are reused as-is
+    __slots__ = (
+        "damage", "img", "original_image", "rotations", "angle", "x", "y", "prev_x",
+        "speed", "facing_right", "active", "image", "rect", "index",
+    )
+    
+    def __init__(self, x, y, facing_right,is_big, speed=SPEED):
+        self.rect = pygame.Rect(0, 0, 0, 0) # Collision rectangle, reused across throws
+        self.index = -1 # Slot in the owning ShurikenPool (-1 when not pooled)
+        self.reset(x, y, facing_right, is_big, speed)
+
+    def reset(self, x, y, facing_right, is_big, speed=SPEED):
+        """(Re)initialize the shuriken for a new throw, so pooled ones can be reused."""
         
         self.damage = 10  # 💥 damage on hit
         
@@ -16,6 +50,7 @@ class Shuriken:
             self.img = "small_shuriken" 
             
         self.original_image = images[self.img]
+        self.rotations = get_rotations(self.img) # Shared pre-rotated frames
         
         # Starting angle
         self.angle = 0
@@ -23,33 +58,130 @@ class Shuriken:
         # Set its position (x, y)
         self.x = x
         self.y = y + 30  # Slight offset so it comes from the hand
+        self.prev_x = x # Position at the start of the last tick (for render interpolation)
         
         # Set its speed (move right or left depending on player direction)
-        self.speed = 10 if facing_right  else -10
+        self.speed = speed if facing_right  else -speed
     
         self.facing_right = facing_right # Remember the direction it's going
         self.active = True # This is used to check if it should still be on screen
         
-        # Create a rectangle for collision or screen limits
+        # Place the rectangle for collision or screen limits
         self.image = self.original_image
-        self.rect = self.image.get_rect(topleft=(self.x, self.y))
+        width, height = self.image.get_size()
+        self.rect.update(self.x, self.y, width, height)
 
     def update(self):
         # Move the shuriken
+        self.prev_x = self.x
         self.x += self.speed
         self.rect.x = self.x # Update rectangle position
         
         # Spin the shuriken
-        self.angle = (self.angle + 15) % 360  # Rotate 15 degrees every frame
-        self.image = pygame.transform.rotate(self.original_image, self.angle)
+        self.angle = (self.angle + ROTATION_STEP) % 360  # Rotate 15 degrees every frame
+        self.image, width, height, half_w, half_h = self.rotations[self.angle // ROTATION_STEP]
 
-        # Recalculate position to center the rotated image
-        self.rect = self.image.get_rect(center=self.rect.center)
+        # Recenter the rectangle on the rotated image
+        center_x, center_y = self.rect.center
+        self.rect.update(center_x - half_w, center_y - half_h, width, height)
 
         # If it goes off screen, mark it as inactive
         if self.x < -50 or self.x > 1050:
             self.active = False
 
-    def draw(self, surface):
-        # Draw the spinning shuriken
-        surface.blit(self.image, self.rect.topleft)
+    def draw(self, surface, alpha=1.0):
+        # Draw the spinning shuriken between its previous (alpha 0) and current (alpha 1)
+        # position and return the area it covered
+        x = self.rect.x - round((self.x - self.prev_x) * (1 - alpha))
+        return surface.blit(self.image, (x, self.rect.y))
+
+    def snapshot(self):
+        """Return the shuriken's state as a compact tuple (see restore)."""
+        return (self.x, self.y, self.speed, self.damage, self.angle, tuple(self.rect), self.active)
+
+    def restore(self, state):
+        """Put the shuriken into a state returned by snapshot()."""
+        x, y, speed, damage, angle, rect, active = state
+        self.reset(x, y, speed > 0, damage != 10, abs(speed))
+        self.y = y
+        self.angle = angle
+        self.image = self.rotations[angle // ROTATION_STEP][0]
+        self.rect.update(rect)
+        self.active = active
+
+# ----------------- Shuriken Pool -----------------
+class ShurikenPool:
+    """A fighter's shurikens in flight, reusing Shuriken objects between throws.
+
+    Live shurikens are packed at the front of a list and each one knows its
+    slot, so acquire() and release() are O(1): a released shuriken's slot is
+    filled by the last live one (swap-remove) and the object goes on a free
+    list for the next throw. Iteration order is therefore slot order, not
+    throw order. Supports len(), iteration and indexing over live shurikens.
+    """
+
+    __slots__ = ("live", "free")
+
+    def __init__(self):
+        self.live = [] # Shurikens in flight, by slot
+        self.free = [] # Released shurikens waiting to be thrown again
+
+    def __len__(self):
+        return len(self.live)
+
+    def __iter__(self):
+        return iter(self.live)
+
+    def __getitem__(self, index):
+        return self.live[index]
+
+    def acquire(self, x, y, facing_right, is_big, speed=SPEED):
+        """Throw a shuriken (reusing a released one if possible) and return it."""
+        if self.free:
+            shuriken = self.free.pop()
+            shuriken.reset(x, y, facing_right, is_big, speed)
+        else:
+            shuriken = Shuriken(x, y, facing_right, is_big, speed)
+        shuriken.index = len(self.live)
+        self.live.append(shuriken)
+        return shuriken
+
+    def release(self, shuriken):
+        """Take a live shuriken out of play; the last live one moves into its slot."""
+        last = self.live.pop()
+        if last is not shuriken:
+            self.live[shuriken.index] = last
+            last.index = shuriken.index
+        shuriken.index = -1
+        shuriken.active = False
+        self.free.append(shuriken)
+
+    def release_inactive(self):
+        """Release every shuriken whose active flag was cleared."""
+        live = self.live
+        index = 0
+        while index < len(live):
+            if live[index].active:
+                index += 1
+            else:
+                self.release(live[index]) # Refills this slot, so check it again
+
+    def update(self):
+        """Move every live shuriken and release the ones that left the screen."""
+        for shuriken in self.live:
+            shuriken.update()
+        self.release_inactive()
+
+    def clear(self):
+        """Release every live shuriken."""
+        for shuriken in self.live:
+            shuriken.index = -1
+            shuriken.active = False
+        self.free.extend(self.live)
+        self.live.clear()
+
+    def restore(self, states):
+        """Replace the live shurikens with ones rebuilt from Shuriken.snapshot() tuples."""
+        self.clear()
+        for state in states:
+            self.acquire(0, 0, True, False).restore(state)
@@ -0,0 +1,443 @@
+import zlib
+import pygame
+import random
+import player
+import enemy
+from collision import SpatialGrid, sweep_rect
+
+# ----------------- Collision Settings -----------------
+BROAD_PHASE_MIN = 32 # Shuriken count from which hits are found through the grid
+
+# ----------------- Input Bits -----------------
+# One bit per key read by Character.handle_input, so a tick of input is a single int
+LEFT = 1
+RIGHT = 2
+UP = 4
+DOWN = 8
+SPACE = 16
+SHIFT = 32
+
+KEY_BITS = {
+    pygame.K_LEFT: LEFT,
+    pygame.K_RIGHT: RIGHT,
+    pygame.K_UP: UP,
+    pygame.K_DOWN: DOWN,
+    pygame.K_SPACE: SPACE,
+    pygame.K_LSHIFT: SHIFT,
+    pygame.K_RSHIFT: SHIFT,
+}
+
+def keys_to_mask(keys):
+    """Pack a pygame.key.get_pressed() result into an input bitmask."""
+    mask = 0
+    for key, bit in KEY_BITS.items():
+        if keys[key]:
+            mask |= bit
+    return mask
+
+
+class InputState:
+    """Read-only keyboard view over an input bitmask.
+
+    Indexable with pygame key constants just like pygame.key.get_pressed(),
+    so Character.handle_input works unchanged on simulated input.
+    """
+
+    __slots__ = ("mask",)
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        return self.mask & KEY_BITS.get(key, 0)
+
+
+class MatchRandom(random.Random):
+    """random.Random counting the values drawn from it (calls): one per
+    random() or randint() call.
+
+    getrandbits is overridden too, unchanged: a subclass that overrides only
+    random() gets randint() built on that random() (Random.__init_subclass__),
+    which would count every randint() more than once and draw another stream
+    than random.Random(seed). With both overridden, randint() draws from
+    getrandbits like random.Random does.
+
+    A call count alone does not fix the generator state: random() always
+    uses two 32-bit words, randint() one word per try (it rejects values
+    out of range and tries again). Within a match it does: which draw each
+    call makes (random(), randint(1, 2) or randint(1, 10)) follows from the
+    hashed match state and the inputs, so two runs of the same seed that
+    agree on that state and on calls made the same draws. That is what lets
+    Match.state_hash cover the random stream through (seed, calls) instead
+    of the 625 words of getstate().
+    """
+
+    def seed(self, a=None, version=2):
+        self.calls = 0
+        super().seed(a, version)
+
+    def random(self):
+        self.calls += 1
+        return super().random()
+
+    def randint(self, a, b):
+        self.calls += 1
+        return super().randint(a, b)
+
+    def getrandbits(self, k):
+        return super().getrandbits(k)
+
+    def getstate(self):
+        return super().getstate(), self.calls
+
+    def setstate(self, state):
+        state, self.calls = state
+        super().setstate(state)
+
+
+class Match:
+    """Render-free Naruto vs Sasuke match advanced one tick at a time with step().
+
+    Holds the fighters, their shurikens and health, and applies the battle
+    rules without touching the display, the clock or the mixer. Rendering
+    and sound are left to consumers (see battle.Battle) which read the
+    fighters' state and the sound events returned by step().
+
+    With a seed, both fighters draw from one MatchRandom(seed) so the same
+    seed and inputs always replay the same match (deterministic mode, checked
+    with state_hash()); without one they use the global random module.
+
+    With shuriken_clashes, opposing shurikens that touch destroy each other.
+    """
+
+    def __init__(self, headless=True, seed=None, shuriken_clashes=False):
+        self.seed = seed
+        self.shuriken_clashes = shuriken_clashes
+        self.grid = SpatialGrid() # Broad phase, refilled for every collision pass
+        self.rng = MatchRandom(seed) if seed is not None else random
+
+        # ----------------- Create Characters -----------------
+        self.naruto = player.Character(10, 510, headless=headless, rng=self.rng)
+        self.sasuke = enemy.Enemy(890, 510, headless=headless, rng=self.rng)
+
+        # ----------------- Match State -----------------
+        self.tick = 0 # Number of simulated ticks
+        self.winner = None # "naruto" or "sasuke" once the opponent is defeated
+        self.events = [] # Sound events raised during the last tick
+        self.inputs = InputState()
+
+        # Per-fighter totals: health taken from the opponent and shurikens blocked
+        self.stats = {
+            "naruto": {"damage": 0, "blocks": 0},
+            "sasuke": {"damage": 0, "blocks": 0},
+        }
+
+        # Both fighters report their sound events into the match's list
+        self.naruto.events = self.events
+        self.sasuke.events = self.events
+
+    @property
+    def is_over(self):
+        """True once a winner is decided or both fighters are down."""
+        return self.winner is not None or (
+            self.naruto.health_bar.health <= 0 and self.sasuke.health_bar.health <= 0)
+
+    def snapshot(self):
+        """Capture the full match state (fighters, health, shurikens, timers, RNG) as a tuple.
+
+        The snapshot shares nothing mutable with the match, so it can be kept
+        and restored any number of times.
+        """
+        return (
+            self.tick,
+            self.winner,
+            self.rng.getstate(),
+            tuple(tuple(stats.values()) for stats in self.stats.values()),
+            tuple(self._fighter_snapshot(fighter) for fighter in (self.naruto, self.sasuke)),
+        )
+
+    def reseed(self, seed):
+        """Restart the random stream from seed, as Match(seed=seed) would have (e.g. for a new round)."""
+        self.seed = seed
+        self.rng.seed(seed)
+
+    def state_hash(self):
+        """Return a CRC-32 of the full match state, cheap enough to take every tick.
+
+        Covers everything snapshot() does, the random stream as its seed and
+        number of draws, so two runs of the same seed and inputs produce the
+        same hash at every tick on any machine, and the first tick where they
+        differ is where they desynced.
+        """
+        state = (
+            self.tick,
+            self.winner,
+            self.seed,
+            getattr(self.rng, "calls", None),
+            tuple(tuple(stats.values()) for stats in self.stats.values()),
+            tuple(self._fighter_snapshot(fighter) for fighter in (self.naruto, self.sasuke)),
+        )
+        return zlib.crc32(repr(state).encode())
+
+    def restore(self, snapshot, rng=True):
+        """Put the match back into a state captured by snapshot().
+
+        Args:
+            snapshot (tuple): Value returned by snapshot().
+            rng (bool): Also rewind the random source; pass False to keep the
+                current random stream (e.g. for a fresh rematch).
+        """
+        self.tick, self.winner, rng_state, stats, fighters = snapshot
+        if rng:
+            self.rng.setstate(rng_state)
+
+        for totals, values in zip(self.stats.values(), stats):
+            totals.update(zip(totals, values))
+
+        for fighter, state in zip((self.naruto, self.sasuke), fighters):
+            self._fighter_restore(fighter, state)
+
+        self.events.clear()
+
+    @staticmethod
+    def _fighter_snapshot(fighter):
+        return (
+            tuple(getattr(fighter, field) for field in fighter.SNAPSHOT_FIELDS),
+            fighter.health_bar.health,
+            fighter.health_bar.damage,
+            tuple(shuriken.snapshot() for shuriken in fighter.shurikens),
+        )
+
+    @staticmethod
+    def _fighter_restore(fighter, state):
+        values, fighter.health_bar.health, fighter.health_bar.damage, shurikens = state
+        for field, value in zip(fighter.SNAPSHOT_FIELDS, values):
+            setattr(fighter, field, value)
+        fighter.shurikens.restore(shurikens)
+        fighter.prev_x, fighter.prev_y = fighter.x, fighter.y
+        fighter.update_hitbox()
+
+    def step(self, inputs=0):
+        """Advance the match by one tick and return the sound events it raised.
+
+        Args:
+            inputs (int): Bitmask of the player's pressed keys (LEFT, RIGHT, ...).
+
+        Returns:
+            list: Sound event names ("throw", "jump", "hit"), valid until the next step.
+        """
+        self.events.clear()
+        self.inputs.mask = inputs
+
+        # Canonical tick order, which replays and state hashes rely on: Naruto's
+        # whole update (input, physics, animation, shurikens, his hits), then
+        # Sasuke's, then clashes. Fighters only draw from the match's rng.
+
+        # Remember where the fighters started this tick (for render interpolation)
+        for fighter in (self.naruto, self.sasuke):
+            fighter.prev_x, fighter.prev_y = fighter.x, fighter.y
+
+        # Character Logic (movement, attacks, shuriken updates)
+        self.handle_character_logic(self.naruto, self.sasuke, is_player=True)
+        self.handle_character_logic(self.sasuke, self.naruto, is_player=False)
+
+        # Opposing shurikens cancel each other out
+        if self.shuriken_clashes:
+            self.check_clashes()
+
+        self.tick += 1
+        return self.events
+
+    def handle_character_logic(self, character, opponent, is_player=True):
+        """ Handles movement, shuriken updates, physics, health, and state. """
+
+        # Only update if character is alive
+        if character.health_bar.health > 0:
+            if opponent.health_bar.health > 0:
+                # If character is player-controlled, handle keyboard input
+                if is_player:
+                    character.handle_input(self.inputs)
+                else:
+                    # If character is enemy-controlled, run enemy movement logic
+                    character.move_enemy()
+            else:
+                # Opponent is defeated, current character becomes winner
+                character.state = "winner"
+                self.winner = "naruto" if is_player else "sasuke"
+
+        # If character's health is zero or below
+        else:
+            # Only change to defeated state once (prevents re-triggering every frame)
+            if character.state != "defeated":
+                character.state = "defeated"
+                character.frame = 0  # Reset defeated animation frame
+
+        # Apply gravity and physics (jumping, falling)
+        character.apply_physics()
+
+        # Advance the animation and move the hitbox along
+        character.update_animation()
+        character.update_hitbox()
+
+        # Update shurikens
+        character.update_shurikens()
+
+        # Check if character's shuriken hit the opponent
+        self.check_damage(character, opponent,is_player)
+
+    def check_damage(self, attacker, target, is_player):
+        """Checks if any of the attacker's shurikens hit the target
+        and applies damage or effects."""
+        shurikens = attacker.shurikens
+
+        # Small volleys: scan the whole pool; large ones: only the shurikens the broad phase puts near the target
+        candidates = shurikens if len(shurikens) < BROAD_PHASE_MIN else self.hit_candidates(shurikens, target)
+
+        # Find every hit first, then resolve them in slot order, so blocks and
+        # damage come out the same whichever path found them
+        hits = [shuriken for shuriken in candidates if self.impact_time(shuriken, target) is not None]
+        for shuriken in hits:
+            self.apply_hit(attacker, target, shuriken, is_player)
+        if hits:
+            shurikens.release_inactive()
+
+    def apply_hit(self, attacker, target, shuriken, is_player):
+        """Resolves a shuriken reaching the target: block or damage, stats, sound."""
+        health = target.health_bar.health
+
+        # Check if target is not blocking (based on player/enemy logic)
+        if self.check_block(is_player,target):
+            self.stats[target.name]["blocks"] += 1
+        else:
+            # Determine type of damage based on shuriken's damage value
+            if shuriken.damage == 10:
+                target.state = "small_damage" # Light hit animation
+            else:
+                target.state = "big_damage" # Heavy hit animation
+
+            # Set hit flag and reset animation frame for smooth transition
+            target.is_hit = True
+            target.frame = 0
+
+        self.stats[attacker.name]["damage"] += health - target.health_bar.health
+
+        # Remove the shuriken after collision (whether it caused damage or was blocked);
+        # check_damage releases it once every hit of the tick is resolved
+        shuriken.active = False
+
+        # Raise hit sound effect
+        self.events.append("hit")
+
+    def hit_candidates(self, shurikens, target):
+        """Return the shurikens the grid broad phase finds near the target this tick, in slot order.
+
+        Each shuriken is indexed by the area it swept this tick, so the cost
+        stays linear in the number of shurikens. Confirm with impact_time().
+        """
+        grid = self.grid
+        grid.clear()
+        for shuriken in shurikens:
+            grid.insert(shuriken, shuriken.rect.union(shuriken.rect.move(shuriken.prev_x - shuriken.x, 0)))
+
+        target_area = target.rect.union(target.rect.move(target.prev_x - target.x, target.prev_y - target.y))
+        return [grid.items[index] for index in grid.query(target_area)]
+
+    def impact_time(self, shuriken, target):
+        """Return when (0 to 1 through this tick) the shuriken hit the target's hitbox, or None.
+
+        The shuriken's move this tick is swept against the hitbox in the
+        target's frame of reference, so fast shurikens, coarse tick rates or a
+        fighter running through a shuriken cannot tunnel past the hitbox.
+        """
+        dx = (shuriken.x - shuriken.prev_x) - (target.x - target.prev_x)
+        dy = target.prev_y - target.y
+        return sweep_rect(shuriken.rect.move(-dx, -dy), dx, dy, target.rect)
+
+    def check_clashes(self):
+        """Destroys every pair of touching shurikens thrown by different fighters."""
+
+        # Index Naruto's shurikens, then look up candidates for each of Sasuke's
+        grid = self.grid
+        grid.clear()
+        for shuriken in self.naruto.shurikens:
+            grid.insert(shuriken, shuriken.rect)
+
+        clashed = False
+        for shuriken in self.sasuke.shurikens:
+            for index in grid.query(shuriken.rect):
+                other = grid.items[index]
+                if shuriken.rect.colliderect(other.rect):
+                    shuriken.active = False
+                    other.active = False
+                    clashed = True
+
+        if clashed:
+            for fighter in (self.naruto, self.sasuke):
+                fighter.shurikens.release_inactive()
+            self.events.append("block") # Clash sound
+
+    def check_block(self,is_player,target):
+        """Checks if the target is currently blocking and
+        whether the block is successful or broken."""
+
+        # If the target is the enemy (not the player)
+        if not is_player:
+            if target.state == "block" :
+                target.block_count += 1 # Increase block count each time enemy blocks
+
+                # Enemy can block only 2 times consecutively
+                if target.block_count > 2:
+                    target.health_bar.player_hit() #Take damage if block limit exceeded
+                    return False  # Block failed
+
+                return True  # Block successful
+
+            # If not blocking, take damage
+            if target.state != "block" :
+                target.health_bar.player_hit()
+                return False
+
+        else:
+            # For Enemy, increase hit count (used to track when to reset block)
+            target.hit_count += 1
+            if target.state != "block" :
+                target.health_bar.enemy_hit() # Take damage
+                return False # Block failed
+
+            return True # Block successful
+
+
+class ScriptedPlayer:
+    """Rule-based stand-in for the human player, returning an input bitmask per tick.
+
+    Faces Sasuke and keeps throwing, blocks shurikens about to land and jumps
+    now and then. Used to drive headless matches (tournaments, benchmarks).
+    """
+
+    def __init__(self, seed=None, block_range=140, jump_chance=0.02, big_chance=0.3):
+        self.rng = random.Random(seed)
+        self.block_range = block_range # Distance at which incoming shurikens are blocked
+        self.jump_chance = jump_chance # Chance to jump on a free tick
+        self.big_chance = big_chance # Chance a throw uses the big shuriken
+
+    def __call__(self, match):
+        me, foe = match.naruto, match.sasuke
+
+        # ---- Block shurikens flying towards us ----
+        if me.block_count < 2:
+            for shuriken in foe.shurikens:
+                distance = me.rect.centerx - shuriken.rect.centerx
+                if 0 <= distance * shuriken.speed < self.block_range * abs(shuriken.speed):
+                    return DOWN
+
+        # ---- Turn towards the enemy, otherwise attack ----
+        if (foe.x > me.x) != me.facing_right:
+            mask = RIGHT if foe.x > me.x else LEFT
+        else:
+            mask = SPACE
+            if self.rng.random() < self.big_chance:
+                mask |= SHIFT
+
+        if self.rng.random() < self.jump_chance:
+            mask |= UP
+        return mask
@@ -0,0 +1,123 @@
+import os
+import mmap
+import struct
+import hashlib
+import tempfile
+import threading
+import pygame
+
+# ----------------- Cache Settings -----------------
+CACHE_ENV = "SHINOBI_CACHE" # Overrides the cache directory
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "shinobi_saga")
+
+# Header of a cache file, followed by width * height * 4 bytes of RGBA pixels:
+# magic, width, height, source file mtime (ns), source file size
+MAGIC = b"SSC1"
+HEADER = struct.Struct("<4sIIqq")
+
+def cache_dir():
+    """Directory holding the decoded images (SHINOBI_CACHE or ~/.cache/shinobi_saga)."""
+    return os.environ.get(CACHE_ENV) or DEFAULT_CACHE_DIR
+
+def cache_path(source):
+    """Cache file of an image, named after its absolute path."""
+    key = hashlib.sha1(os.path.abspath(source).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir(), key + ".rgba")
+
+# ----------------- Reading -----------------
+def read_cached(source, stat, prepare):
+    """Return prepare(surface) from the cached pixels of source, or None if missing or stale.
+
+    The file is memory-mapped and wrapped in a surface without copying;
+    prepare (e.g. convert_alpha) makes the copy that outlives the mapping.
+    """
+    try:
+        file = open(cache_path(source), "rb")
+    except OSError:
+        return None
+
+    with file:
+        size = os.fstat(file.fileno()).st_size
+        if size < HEADER.size:
+            return None
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            magic, width, height, mtime, source_size = HEADER.unpack_from(mapped)
+            if (magic != MAGIC or mtime != stat.st_mtime_ns or source_size != stat.st_size
+                    or size != HEADER.size + width * height * 4):
+                return None # Source changed (or foreign file): decode it again
+
+            pixels = memoryview(mapped)[HEADER.size:]
+            surface = pygame.image.frombuffer(pixels, (width, height), "RGBA")
+            result = prepare(surface)
+            if result is surface:
+                result = surface.copy() # Nothing copied the pixels out of the mapping yet
+            del surface
+            pixels.release()
+            return result
+
+# ----------------- Writing -----------------
+def write_cached(source, stat, surface):
+    """Store a decoded surface's pixels for source. Failures only mean no cache."""
+    try:
+        directory = cache_dir()
+        os.makedirs(directory, exist_ok=True)
+        header = HEADER.pack(MAGIC, surface.get_width(), surface.get_height(), stat.st_mtime_ns, stat.st_size)
+        pixels = pygame.image.tobytes(surface, "RGBA")
+
+        # Write next to the target and swap it in, so readers never see a partial file
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as file:
+            file.write(header)
+            file.write(pixels)
+        os.replace(temp_path, cache_path(source))
+    except OSError:
+        pass
+
+# ----------------- Loading -----------------
+def load_surface(source, prepare):
+    """Return prepare(surface) for the image file source, decoding it only on a cache miss.
+
+    Args:
+        source (str): Path of the image file.
+        prepare (callable): Turns the decoded surface into the one to keep
+            (e.g. assets.prepare_surface).
+    """
+    stat = os.stat(source)
+    surface = read_cached(source, stat, prepare)
+    if surface is None:
+        image = pygame.image.load(source)
+        write_cached(source, stat, image)
+        surface = prepare(image)
+    return surface
+
+# ----------------- Warming -----------------
+def is_cached(source):
+    """True if source has an up-to-date cache file."""
+    try:
+        stat = os.stat(source)
+        with open(cache_path(source), "rb") as file:
+            header = file.read(HEADER.size)
+    except OSError:
+        return False
+    if len(header) < HEADER.size:
+        return False
+    magic, _, _, mtime, source_size = HEADER.unpack(header)
+    return magic == MAGIC and mtime == stat.st_mtime_ns and source_size == stat.st_size
+
+def warm(sources):
+    """Decode and cache every image not cached yet, in a background thread.
+
+    Used for images that are only loaded later (e.g. the help screen, or
+    the next start), so their first load reads the cache. Returns the thread.
+    """
+    def run():
+        for source in sources:
+            if not is_cached(source):
+                try:
+                    write_cached(source, os.stat(source), pygame.image.load(source))
+                except (OSError, pygame.error):
+                    pass
+
+    thread = threading.Thread(target=run, name="surface-cache-warm", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+
+import simulation
+
+# ----------------- Sync Check Settings -----------------
+DEFAULT_TICKS = 60 * 60 # One minute of game time
+
+# ----------------- Hash Logs -----------------
+def run_to(seed, ticks, on_tick=None):
+    """Play the seeded match (scripted player) for ticks ticks and return it.
+
+    on_tick(match) is called on the starting state and after every tick.
+    """
+    match = simulation.Match(headless=True, seed=seed)
+    bot = simulation.ScriptedPlayer(seed)
+    if on_tick:
+        on_tick(match)
+    while match.tick < ticks:
+        match.step(bot(match))
+        if on_tick:
+            on_tick(match)
+    return match
+
+def hash_log(seed, ticks=DEFAULT_TICKS):
+    """Match.state_hash() of the seeded match at tick 0, 1, ... ticks."""
+    hashes = []
+    run_to(seed, ticks, lambda match: hashes.append(match.state_hash()))
+    return hashes
+
+def format_log(hashes):
+    return "".join(f"{tick} {value:08x}\n" for tick, value in enumerate(hashes))
+
+def parse_log(text):
+    return [int(line.split()[1], 16) for line in text.splitlines() if line.strip()]
+
+def first_desync(hashes, other):
+    """First tick at which two hash logs differ, or None if they agree on every common tick."""
+    for tick, (value, other_value) in enumerate(zip(hashes, other)):
+        if value != other_value:
+            return tick
+    return None
+
+# ----------------- State Dumps -----------------
+def describe(match):
+    """The state Match.state_hash() covers, as a JSON-friendly dict (for diffing two runs)."""
+    state = {
+        "tick": match.tick,
+        "winner": match.winner,
+        "rng_calls": getattr(match.rng, "calls", None),
+        "stats": match.stats,
+    }
+    for fighter in (match.naruto, match.sasuke):
+        fields = {field: getattr(fighter, field) for field in fighter.SNAPSHOT_FIELDS}
+        fields["health"] = fighter.health_bar.health
+        fields["health_offset"] = fighter.health_bar.damage
+        fields["shurikens"] = [list(shuriken.snapshot()[:5]) + [list(shuriken.rect)] for shuriken in fighter.shurikens]
+        state[fighter.name] = fields
+    return json.loads(json.dumps(state)) # Tuples as lists, like a dump read back
+
+def differences(state, other, path=""):
+    """Dotted paths of the values that differ between two describe() dicts."""
+    if isinstance(state, dict) and isinstance(other, dict):
+        found = []
+        for key in state.keys() | other.keys():
+            found += differences(state.get(key), other.get(key), f"{path}.{key}" if path else key)
+        return sorted(found)
+    return [] if state == other else [path]
+
+# ----------------- Cross-Process Check -----------------
+def run_elsewhere(*args):
+    # This script in a fresh interpreter with another string hash seed, so
+    # anything depending on set/dict order of strings would show up
+    env = dict(os.environ, PYTHONHASHSEED=str(random.randrange(1, 2**32)), PYGAME_HIDE_SUPPORT_PROMPT="1")
+    return subprocess.run([sys.executable, os.path.abspath(__file__), *map(str, args)],
+                          env=env, capture_output=True, text=True, check=True).stdout
+
+def check(seed, ticks):
+    """Compare this process's hash log with a fresh interpreter's.
+
+    Returns None when they agree, otherwise (tick, differing fields).
+    """
+    hashes = hash_log(seed, ticks)
+    tick = first_desync(hashes, parse_log(run_elsewhere("log", "-s", seed, "-t", ticks)))
+    if tick is None:
+        return None
+    other = json.loads(run_elsewhere("state", "-s", seed, "-t", tick))
+    return tick, differences(describe(run_to(seed, tick)), other)
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that seeded matches replay identically (per-tick state hashes).")
+    commands = parser.add_subparsers(dest="command", required=True)
+    log = commands.add_parser("log", help="print the state hash of every tick")
+    state = commands.add_parser("state", help="print the full match state at one tick as JSON")
+    compare = commands.add_parser("compare", help="find the first tick two hash logs differ")
+    run_check = commands.add_parser("check", help="compare with a run in a fresh interpreter")
+    for command in (log, state, run_check):
+        command.add_argument("-s", "--seed", type=int, default=0, help="match seed")
+        command.add_argument("-t", "--ticks", type=int, default=DEFAULT_TICKS, help="ticks to play")
+    log.add_argument("-o", "--out", help="write the log to a file instead")
+    compare.add_argument("logs", nargs=2, help="two files written by log")
+    args = parser.parse_args()
+
+    if args.command == "log":
+        text = format_log(hash_log(args.seed, args.ticks))
+        if args.out:
+            with open(args.out, "w") as file:
+                file.write(text)
+        else:
+            sys.stdout.write(text)
+
+    elif args.command == "state":
+        print(json.dumps(describe(run_to(args.seed, args.ticks)), indent=2))
+
+    elif args.command == "compare":
+        logs = []
+        for path in args.logs:
+            with open(path) as file:
+                logs.append(parse_log(file.read()))
+        tick = first_desync(*logs)
+        if tick is not None:
+            sys.exit(f"desync at tick {tick}: compare the output of 'state -t {tick}' on both sides")
+        print(f"in sync for {min(map(len, logs))} ticks")
+
+    else:
+        result = check(args.seed, args.ticks)
+        if result is not None:
+            tick, fields = result
+            sys.exit(f"desync at tick {tick}: {', '.join(fields) or 'no state field differs'}")
+        print(f"seed {args.seed}: in sync for {args.ticks + 1} ticks")
+
+# -------------------- Check Determinism --------------------
+if __name__ == "__main__":
+    main()
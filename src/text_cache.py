@@ -0,0 +1,48 @@
+import pygame
+from collections import OrderedDict
+
+# ----------------- Cache Settings -----------------
+MAX_TEXT_SURFACES = 256 # Least recently used text surfaces beyond this are dropped
+
+_fonts = {} # (name, size, bold, italic) -> pygame font
+_text_surfaces = OrderedDict() # (name, size, bold, italic, text, color, antialias) -> rendered surface
+
+# ----------------- Font Lookup -----------------
+def get_font(name, size, bold=False, italic=False):
+    """Return a system font, creating it only the first time it is asked for."""
+    key = (name, size, bold, italic)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = _fonts[key] = pygame.font.SysFont(name, size, bold, italic)
+    return font
+
+# ----------------- Text Rendering -----------------
+def render_text(text, name, size, color, antialias=True, bold=False, italic=False):
+    """Return the rendered surface for a piece of text, rasterising it only on a cache miss.
+
+    Args:
+        text (str): The string to render.
+        name (str): System font name (as for pygame.font.SysFont).
+        size (int): Font size.
+        color: Text colour (name or RGB tuple).
+        antialias (bool): Render with antialiasing.
+        bold (bool), italic (bool): Font style.
+
+    Returns:
+        pygame.Surface: Shared surface, callers must not draw on it.
+    """
+    key = (name, size, bold, italic, text, color, antialias)
+    surface = _text_surfaces.get(key)
+    if surface is not None:
+        _text_surfaces.move_to_end(key) # Mark as most recently used
+        return surface
+
+    surface = get_font(name, size, bold, italic).render(text, antialias, color)
+    _text_surfaces[key] = surface
+
+    # Evict the least recently used surface once the cache is full
+    if len(_text_surfaces) > MAX_TEXT_SURFACES:
+        _text_surfaces.popitem(last=False)
+    return surface
@@ -0,0 +1,116 @@
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import time
+
+import simulation
+
+# ----------------- Tournament Settings -----------------
+DEFAULT_MATCHES = 1000
+DEFAULT_MAX_TICKS = 60 * 60 * 5 # Matches still running after 5 minutes of game time are draws
+TICK_RATE = 60 # Simulation ticks per second of game time
+
+# ----------------- Single Match -----------------
+def run_match(seed, max_ticks=DEFAULT_MAX_TICKS):
+    """Play one seeded headless match with the scripted player and return its result.
+
+    The same seed always produces the same match: the match RNG and the
+    scripted player's RNG are both derived from it.
+    """
+    match = simulation.Match(headless=True, seed=seed)
+    bot = simulation.ScriptedPlayer(seed)
+
+    while not match.is_over and match.tick < max_ticks:
+        match.step(bot(match))
+
+    return {
+        "seed": seed,
+        "winner": match.winner or "draw",
+        "ticks": match.tick,
+        "stats": match.stats,
+    }
+
+def _run_match(args):
+    # Pool.imap only passes one argument per task
+    return run_match(*args)
+
+# ----------------- Aggregation -----------------
+def summarize(results):
+    """Aggregate match results into win rates, match lengths, damage and blocks."""
+    count = len(results)
+    ticks = [result["ticks"] for result in results]
+
+    summary = {
+        "matches": count,
+        "win_rate": {
+            name: sum(result["winner"] == name for result in results) / count
+            for name in ("naruto", "sasuke", "draw")
+        },
+        "match_ticks": {
+            "mean": statistics.mean(ticks),
+            "median": statistics.median(ticks),
+            "min": min(ticks),
+            "max": max(ticks),
+        },
+    }
+
+    # Average damage dealt and shurikens blocked per match for each fighter
+    for name in ("naruto", "sasuke"):
+        summary[name] = {
+            stat: statistics.mean(result["stats"][name][stat] for result in results)
+            for stat in ("damage", "blocks")
+        }
+    return summary
+
+def print_summary(summary, elapsed):
+    """Print a human readable tournament report."""
+    ticks = summary["match_ticks"]
+    print(f"Matches played : {summary['matches']} in {elapsed:.2f}s")
+    for name, rate in summary["win_rate"].items():
+        label = "draws" if name == "draw" else f"{name} wins"
+        print(f"  {label:<12} : {rate:6.1%}")
+    print(f"Match length   : mean {ticks['mean'] / TICK_RATE:.1f}s, median {ticks['median'] / TICK_RATE:.1f}s "
+          f"(ticks {ticks['min']}-{ticks['max']})")
+    for name in ("naruto", "sasuke"):
+        print(f"  {name:<7} avg damage dealt {summary[name]['damage']:6.1f}, "
+              f"avg blocks {summary[name]['blocks']:5.1f}")
+
+# ----------------- Tournament Runner -----------------
+def run_tournament(matches, seed=0, workers=None, max_ticks=DEFAULT_MAX_TICKS):
+    """Run seeded matches seed, seed+1, ... across a process pool and return all results.
+
+    Every worker imports the simulation (and its asset set) once and reuses it
+    for all the matches it plays.
+    """
+    tasks = [(seed + index, max_ticks) for index in range(matches)]
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, matches // (workers * 4))
+
+    with multiprocessing.Pool(workers) as pool:
+        return list(pool.imap(_run_match, tasks, chunksize))
+
+def main():
+    parser = argparse.ArgumentParser(description="Run seeded headless Naruto vs Sasuke matches.")
+    parser.add_argument("-n", "--matches", type=int, default=DEFAULT_MATCHES, help="number of matches to play")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the first match")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS, help="tick limit before a match is a draw")
+    parser.add_argument("--json", metavar="PATH", help="also write the summary and per-match results as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_tournament(args.matches, args.seed, args.workers, args.max_ticks)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    print_summary(summary, elapsed)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"summary": summary, "matches": results}, file, indent=2)
+
+# -------------------- Start Tournament --------------------
+if __name__ == "__main__":
+    main()
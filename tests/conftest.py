@@ -0,0 +1,11 @@
+import os
+import sys
+
+# The game's modules live flat in src/ and load their assets relative to the
+# repository root, like running python src/<script>.py from there
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+os.chdir(ROOT)
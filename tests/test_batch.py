@@ -0,0 +1,6 @@
+import batch
+
+
+def test_parity_with_simulation_match():
+    # Every fighter and shuriken of the batch engine must stay identical to simulation.Match
+    assert batch.parity(matches=8, ticks=500) is None